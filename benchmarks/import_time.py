@@ -0,0 +1,61 @@
+import argparse
+import json
+import subprocess
+import sys
+
+# (import statement, maximum seconds, modules it must not import)
+targets = [
+    ('import presidents.util', 0.25, ['numpy', 'pandas', 'scipy', 'spacy']),
+    ('import presidents.models', 0.25, ['numpy', 'pandas', 'scipy', 'spacy']),
+    ('from presidents.models import Speech', 0.25, ['numpy', 'pandas', 'scipy', 'spacy']),
+    ('import presidents.scrapers.__main__', 1.0, ['numpy', 'pandas', 'scipy', 'spacy']),
+]
+
+# run in a fresh interpreter, so that nothing has been imported already
+_measure_script = '''
+import json, sys, time
+started = time.perf_counter()
+exec(sys.argv[1])
+print(json.dumps({"seconds": time.perf_counter() - started, "modules": sorted(sys.modules)}))
+'''
+
+
+def _measure(statement):
+    '''
+    Return (seconds spent executing `statement`, names of all modules imported) in a fresh interpreter
+    '''
+    output = subprocess.run([sys.executable, '-c', _measure_script, statement],
+                            check=True, stdout=subprocess.PIPE).stdout
+    result = json.loads(output)
+    return result['seconds'], set(result['modules'])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Guard the startup latency of the CLI and the main modules '
+                    '(exits with status 1 if any import is too slow or too heavy)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh interpreters per import (best is used)')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every time limit by this factor')
+    opts = parser.parse_args()
+
+    failures = []
+    for statement, max_seconds, forbidden_modules in targets:
+        measurements = [_measure(statement) for _ in range(opts.repeat)]
+        seconds = min(seconds for seconds, _ in measurements)
+        modules = set.union(*(modules for _, modules in measurements))
+        heavy_modules = sorted(module for module in forbidden_modules if module in modules)
+        limit = max_seconds * opts.scale
+        print(f'{statement:40} {seconds:7.3f}s (limit {limit:.3f}s)')
+        if seconds > limit:
+            failures.append(f'{statement!r} took {seconds:.3f}s (limit {limit:.3f}s)')
+        if heavy_modules:
+            failures.append(f'{statement!r} imported {", ".join(heavy_modules)}')
+
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
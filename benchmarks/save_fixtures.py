@@ -0,0 +1,62 @@
+import argparse
+import logging
+from itertools import islice
+from pathlib import Path
+
+from presidents import DATA_DIR
+from presidents.scraping import get_html
+from presidents.scrapers import millercenter, tapp, whitehouse
+
+logger = logging.getLogger(__name__)
+
+fixtures_dirpath = Path(__file__).parent / 'fixtures'
+
+
+def _tapp_urls():
+    # spread across the categories, which cover all eras
+    for pids_path in sorted((DATA_DIR / 'tapp' / 'category').glob('*.pids')):
+        pid = pids_path.read_text().split()[0]
+        yield tapp.source_url(pid)
+
+
+def _whitehouse_urls():
+    for _, url in whitehouse._iter_group_pages(whitehouse.base_url + '/briefing-room/speeches-and-remarks'):
+        yield url
+
+
+def _millercenter_urls():
+    for _, _, _, href in millercenter._iter_speeches():
+        yield millercenter.base_url + href
+
+
+# the urls of pages worth saving, by scraper (as named in scraper_parsing.parsers)
+url_sources = {
+    'tapp': _tapp_urls,
+    'whitehouse': _whitehouse_urls,
+    'millercenter': _millercenter_urls,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Save pages for benchmarks/scraper_parsing.py, along with their urls',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('scrapers', nargs='*', default=list(url_sources), help='scrapers to save pages for')
+    parser.add_argument('--fixtures', type=Path, default=fixtures_dirpath, help='directory to save pages in')
+    parser.add_argument('--pages', type=int, default=5, help='number of pages to save per scraper')
+    opts = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    for name in opts.scrapers:
+        dirpath = opts.fixtures / name
+        dirpath.mkdir(parents=True, exist_ok=True)
+        with open(dirpath / 'urls.tsv', 'w') as urls_fp:
+            for i, url in enumerate(islice(url_sources[name](), opts.pages)):
+                filename = f'{i:02d}.html'
+                (dirpath / filename).write_text(get_html(url))
+                urls_fp.write(f'{filename}\t{url}\n')
+                logger.info('Saved %s as %s', url, dirpath / filename)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from presidents import scraping
+from presidents.scrapers import millercenter, tapp, whitehouse
+
+# each scraper's parse(html, url) function, by the name of its fixtures subdirectory
+parsers = {
+    'tapp': tapp.parse,
+    'whitehouse': whitehouse.parse,
+    'millercenter': millercenter.parse,
+}
+
+
+def _read_pages(dirpath):
+    '''
+    Read the saved *.html pages in `dirpath`, along with their original urls, as
+    recorded by save_fixtures.py in urls.tsv (falling back to the file's own url)
+    '''
+    urls_path = dirpath / 'urls.tsv'
+    urls = dict(line.split('\t') for line in urls_path.read_text().splitlines()) if urls_path.exists() else {}
+    return [(urls.get(path.name, path.as_uri()), path.read_text()) for path in sorted(dirpath.glob('*.html'))]
+
+
+def _parse_all(parse, pages, restricted_parsing):
+    scraping.restricted_parsing = restricted_parsing
+    started = time.perf_counter()
+    results = [parse(html, url) for url, html in pages]
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare parsing saved HTML pages with and without restricted parsing',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('fixtures', type=Path, nargs='?', default=Path(__file__).parent / 'fixtures',
+                        help='directory containing saved *.html pages in tapp/, whitehouse/, and/or millercenter/ '
+                             '(see save_fixtures.py)')
+    parser.add_argument('--repeat', type=int, default=3, help='number of times to parse each page')
+    opts = parser.parse_args()
+
+    n_parsed = 0
+    for name, parse in parsers.items():
+        pages = _read_pages(opts.fixtures / name) * opts.repeat
+        if not pages:
+            continue
+        n_parsed += len(pages)
+        n_bytes = sum(len(html.encode('utf-8')) for _, html in pages)
+
+        reference_results, reference_elapsed = _parse_all(parse, pages, False)
+        results, elapsed = _parse_all(parse, pages, True)
+
+        assert results == reference_results, f'{name}: restricted parsing changed the output'
+        print(f'{name}: {len(pages):,} pages ({n_bytes / 2**20:,.1f} MiB)')
+        print(f'  full parsing:       {reference_elapsed:8.3f}s ({len(pages) / reference_elapsed:8,.1f} pages/s)')
+        print(f'  restricted parsing: {elapsed:8.3f}s ({len(pages) / elapsed:8,.1f} pages/s)')
+
+    if not n_parsed:
+        sys.exit(f'No saved pages in {opts.fixtures}; run benchmarks/save_fixtures.py first')
+
+
+if __name__ == '__main__':
+    main()
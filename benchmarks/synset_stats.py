@@ -0,0 +1,91 @@
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict
+
+import pandas as pd
+
+from presidents.models import Group, Synset, all_synset_stats
+
+
+@dataclass(frozen=True)
+class _SyntheticSpeech:
+    '''
+    Stand-in for a Speech with precomputed counts, so that this benchmark
+    measures only the statistics and not spaCy parsing
+    '''
+    title: str
+    counts: Dict[str, int]
+    author: str = 'Anonymous'
+    timestamp: datetime = datetime(2017, 1, 20)
+
+    def count_words_by(self, attr_id: int) -> Dict[str, int]:
+        return self.counts
+
+
+def _iter_reference_synset_stats(groups, synsets):
+    '''
+    The original dict-based generator implementation of all_synset_stats
+    '''
+    for group in groups:
+        for synset in synsets:
+            for speech in group.speeches:
+                speech_counts = speech.count_words_by(None)
+                n_matches = sum(
+                    count
+                    for value, count in speech_counts.items()
+                    if value in synset.values
+                )
+                n_total = sum(speech_counts.values())
+                yield {
+                    "group": group.name,
+                    "synset": synset.name,
+                    "n_matches": n_matches,
+                    "n_total": n_total,
+                    "proportion": n_matches / n_total,
+                }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare all_synset_stats against the original dict-based generator',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--groups', type=int, default=5, help='number of groups')
+    parser.add_argument('--speeches', type=int, default=100, help='number of speeches per group')
+    parser.add_argument('--synsets', type=int, default=10, help='number of synsets')
+    parser.add_argument('--synset-size', type=int, default=100, help='number of values per synset')
+    parser.add_argument('--vocabulary', type=int, default=20000, help='vocabulary size')
+    parser.add_argument('--words', type=int, default=2000, help='number of distinct words per speech')
+    opts = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = [f'w{i}' for i in range(opts.vocabulary)]
+    groups = [
+        Group(f'Group {g}', f'group_{g}', [
+            _SyntheticSpeech(f'Speech {g}.{i}',
+                             {word: rng.randint(1, 20) for word in rng.sample(vocabulary, opts.words)})
+            for i in range(opts.speeches)
+        ])
+        for g in range(opts.groups)
+    ]
+    synsets = [Synset(f'synset_{s}', rng.sample(vocabulary, opts.synset_size)) for s in range(opts.synsets)]
+
+    started = time.perf_counter()
+    reference_df = pd.DataFrame(_iter_reference_synset_stats(groups, synsets))
+    reference_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    df = all_synset_stats(groups, synsets)
+    elapsed = time.perf_counter() - started
+
+    pd.testing.assert_frame_equal(df, reference_df, check_dtype=False)
+    n_rows = len(df)
+    print(f'{n_rows:,} (speech, synset) rows')
+    print(f'reference generator: {reference_elapsed:8.3f}s ({n_rows / reference_elapsed:12,.0f} rows/s)')
+    print(f'all_synset_stats:    {elapsed:8.3f}s ({n_rows / elapsed:12,.0f} rows/s)')
+
+
+if __name__ == '__main__':
+    main()
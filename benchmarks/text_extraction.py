@@ -0,0 +1,98 @@
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString
+
+from presidents.scraping import iter_lines
+
+
+def _iter_reference_texts(element):
+    '''
+    The original recursive implementation of scraping.iter_texts
+    '''
+    if isinstance(element, NavigableString):
+        yield str(element)
+    elif element.name == 'li':
+        yield '\n'
+        yield '* '
+        for child in element.children:
+            for text in _iter_reference_texts(child):
+                yield text
+        yield '\n'
+    elif element.name in {'br', 'hr'}:
+        yield '\n'
+    elif element.name in {'p', 'div', 'ol', 'ul'}:
+        yield '\n'
+        for child in element.children:
+            for text in _iter_reference_texts(child):
+                yield text
+        yield '\n'
+    else:
+        for child in element.children:
+            for text in _iter_reference_texts(child):
+                yield text
+
+
+def _iter_reference_lines(*elements):
+    '''
+    The original implementation of scraping.iter_lines, which joins all the texts first
+    '''
+    texts = (text for element in elements for text in _iter_reference_texts(element))
+    lines = ''.join(texts).split('\n')
+    for line in lines:
+        stripped_line = line.strip()
+        if len(stripped_line) != 0:
+            yield stripped_line
+
+
+def _measure(iter_lines_func, soups):
+    '''
+    Extract the lines of each soup, returning (line counts, elapsed seconds, peak traced bytes);
+    memory is traced in a separate pass, since tracing slows everything down
+    '''
+    started = time.perf_counter()
+    # consume each page's lines one at a time, as '\n'.join(...) would
+    line_counts = [sum(1 for _ in iter_lines_func(soup)) for soup in soups]
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    for soup in soups:
+        for _ in iter_lines_func(soup):
+            pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return line_counts, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare scraping.iter_lines against the original recursive implementation',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('paths', nargs='+', type=Path,
+                        help='saved HTML pages, or directories to search (recursively) for *.html pages')
+    parser.add_argument('--largest', type=int, default=10, help='number of (largest) pages to use')
+    opts = parser.parse_args()
+
+    paths = [path for arg in opts.paths for path in (sorted(arg.rglob('*.html')) if arg.is_dir() else [arg])]
+    paths = sorted(paths, key=lambda path: path.stat().st_size, reverse=True)[:opts.largest]
+    soups = [BeautifulSoup(path.read_text(), 'lxml') for path in paths]
+    n_bytes = sum(path.stat().st_size for path in paths)
+    print(f'{len(paths):,} pages ({n_bytes / 2**20:,.1f} MiB), largest first:')
+    for path in paths:
+        print(f'  {path} ({path.stat().st_size:,} bytes)')
+
+    for soup in soups:
+        assert list(iter_lines(soup)) == list(_iter_reference_lines(soup)), 'iter_lines changed the output'
+
+    reference_line_counts, reference_elapsed, reference_peak = _measure(_iter_reference_lines, soups)
+    line_counts, elapsed, peak = _measure(iter_lines, soups)
+    assert line_counts == reference_line_counts
+    print(f'{sum(line_counts):,} lines')
+    print(f'reference iter_lines: {reference_elapsed:8.3f}s (peak {reference_peak / 2**20:8.2f} MiB)')
+    print(f'iter_lines:           {elapsed:8.3f}s (peak {peak / 2**20:8.2f} MiB)')
+
+
+if __name__ == '__main__':
+    main()
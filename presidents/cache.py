@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    nbytes: int = 0
+    items: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def sizeof_mapping(mapping: dict) -> int:
+    '''
+    Estimate the memory footprint of a flat mapping of strings to numbers.
+    '''
+    return sys.getsizeof(mapping) + sum(sys.getsizeof(key) + sys.getsizeof(value)
+                                        for key, value in mapping.items())
+
+
+class LRUCache:
+    '''
+    Mapping that evicts its least recently used items once the total of
+    `sizeof(value)` over all items exceeds `max_bytes`.
+
+    A single item larger than `max_bytes` is not cached at all.
+    '''
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = sys.getsizeof):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.stats = CacheStats()
+        self._items = OrderedDict()
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.stats} max_bytes={self.max_bytes:,}>"
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable, default=None):
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.stats.hits += 1
+            value, _ = self._items[key]
+            return value
+        self.stats.misses += 1
+        return default
+
+    def put(self, key: Hashable, value):
+        self.pop(key)
+        nbytes = self.sizeof(value)
+        if nbytes > self.max_bytes:
+            logger.debug('Not caching %r (%d bytes exceeds max_bytes=%d)', key, nbytes, self.max_bytes)
+            return
+        self._items[key] = (value, nbytes)
+        self.stats.nbytes += nbytes
+        self.stats.items += 1
+        self._evict()
+
+    def pop(self, key: Hashable, default=None):
+        if key not in self._items:
+            return default
+        value, nbytes = self._items.pop(key)
+        self.stats.nbytes -= nbytes
+        self.stats.items -= 1
+        return value
+
+    def resize(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        self._items.clear()
+        self.stats.nbytes = self.stats.items = 0
+
+    def _evict(self):
+        while self.stats.nbytes > self.max_bytes:
+            _, (_, nbytes) = self._items.popitem(last=False)
+            self.stats.nbytes -= nbytes
+            self.stats.items -= 1
+            self.stats.evictions += 1
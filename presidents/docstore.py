@@ -0,0 +1,190 @@
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import hashlib
+import json
+import logging
+import os
+
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
+import spacy
+
+from presidents.cache import LRUCache, sizeof_mapping
+from presidents.text import load_nlp, extra_stop_words, count_words_by
+
+logger = logging.getLogger(__name__)
+
+docstore_dirpath = os.getenv('PRESIDENTS_DOCSTORE', '/tmp/presidents-docstore')
+# in-memory budgets (in bytes) of load_docstore()'s Doc and word-count caches
+docstore_doc_bytes = int(os.getenv('PRESIDENTS_DOCSTORE_DOC_BYTES', 512 * 2**20))
+docstore_counts_bytes = int(os.getenv('PRESIDENTS_DOCSTORE_COUNTS_BYTES', 64 * 2**20))
+
+# rough per-token size of a Doc's underlying TokenC array, in bytes
+_token_nbytes = 128
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def nlp_fingerprint(nlp: Language) -> str:
+    '''
+    Summarize everything about `nlp` that affects the Docs it produces
+    (spaCy version, model name & version, active pipeline, and our stop word
+    customizations) as a short hex digest.
+    '''
+    meta = nlp.meta
+    components = {
+        'spacy': spacy.__version__,
+        'model': f"{meta['lang']}_{meta['name']}-{meta['version']}",
+        'pipeline': nlp.pipe_names,
+        'extra_stop_words': sorted(extra_stop_words),
+    }
+    return text_digest(json.dumps(components, sort_keys=True))[:16]
+
+
+def sizeof_doc(doc: Doc) -> int:
+    '''
+    Estimate the memory footprint of `doc` from its length and tensor.
+    '''
+    tensor_nbytes = getattr(doc.tensor, 'nbytes', 0)
+    return len(doc) * _token_nbytes + tensor_nbytes
+
+
+def _docbin_attrs(nlp: Language) -> List[str]:
+    '''
+    Select the token attributes worth serializing given the active pipeline
+    '''
+    attrs = ['ORTH']
+    pipe_names = set(nlp.pipe_names)
+    if 'tagger' in pipe_names:
+        attrs += ['TAG', 'POS', 'LEMMA']
+    if 'parser' in pipe_names:
+        attrs += ['HEAD', 'DEP']
+    elif 'sentencizer' in pipe_names:
+        attrs += ['SENT_START']
+    if 'ner' in pipe_names:
+        attrs += ['ENT_IOB', 'ENT_TYPE']
+    return attrs
+
+
+class DocStore:
+    '''
+    Content-addressed disk cache of parsed Docs, keyed by the SHA-1 of the text,
+    within a directory specific to the `nlp` pipeline that produced them, so that
+    changing the model or pipeline never reads stale Docs.
+
+    Each Doc is stored as a single-Doc DocBin; Doc.tensor is not stored.
+
+    Recently used Docs are also kept in memory, up to (approximately) `doc_bytes`,
+    along with the results of count_words_by, up to `counts_bytes`, which are
+    cached separately so that they outlive the evicted Docs they came from.
+    '''
+    def __init__(self, dirpath: Path, nlp: Language,
+                 doc_bytes: int = 512 * 2**20, counts_bytes: int = 64 * 2**20):
+        self.nlp = nlp
+        self.dirpath = Path(dirpath) / nlp_fingerprint(nlp)
+        self.attrs = _docbin_attrs(nlp)
+        self.docs = LRUCache(doc_bytes, sizeof_doc)
+        self.counts = LRUCache(counts_bytes, sizeof_mapping)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.dirpath}>"
+
+    def _path(self, digest: str) -> Path:
+        return self.dirpath / digest[:2] / f'{digest}.spacy'
+
+    def __contains__(self, text: str) -> bool:
+        digest = text_digest(text)
+        return digest in self.docs or self._path(digest).exists()
+
+    def get(self, text: str) -> Optional[Doc]:
+        digest = text_digest(text)
+        doc = self.docs.get(digest)
+        if doc is not None:
+            return doc
+        try:
+            data = self._path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+        doc_bin = DocBin().from_bytes(data)
+        doc, = doc_bin.get_docs(self.nlp.vocab)
+        self.docs.put(digest, doc)
+        return doc
+
+    def put(self, doc: Doc):
+        digest = text_digest(doc.text)
+        path = self._path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        doc_bin = DocBin(attrs=self.attrs)
+        doc_bin.add(doc)
+        # write to a temporary file and then move it into place so that
+        # concurrent readers never see a partially written Doc
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(doc_bin.to_bytes())
+        os.replace(tmp_path, path)
+        self.docs.put(digest, doc)
+
+    def parse(self, text: str) -> Doc:
+        '''
+        Return the cached Doc for `text`, or parse and cache it if missing.
+        '''
+        doc = self.get(text)
+        if doc is None:
+            logger.debug('DocStore miss; parsing %d characters', len(text))
+            doc = self.nlp(text)
+            self.put(doc)
+        return doc
+
+    def count_words_by(self, text: str, attr_id: int = spacy.attrs.ORTH) -> Dict[str, int]:
+        '''
+        Return text.count_words_by(self.parse(text), attr_id), cached in memory.
+        '''
+        key = (text_digest(text), attr_id)
+        counts = self.counts.get(key)
+        if counts is None:
+            counts = count_words_by(self.parse(text), attr_id)
+            self.counts.put(key, counts)
+        return counts
+
+    def parse_all(self, texts: Iterable[str], batch_size: int = 100, n_process: int = 1) -> int:
+        '''
+        Ensure that every text in `texts` is cached, parsing all the missing ones
+        in batches of `batch_size` with nlp.pipe (across `n_process` processes).
+
+        Returns the number of texts that had to be parsed.
+        '''
+        missing = list(OrderedDict.fromkeys(text for text in texts if text not in self))
+        logger.info('Parsing %d uncached texts (batch_size=%d, n_process=%d)',
+                    len(missing), batch_size, n_process)
+        for doc in self.nlp.pipe(missing, batch_size=batch_size, n_process=n_process):
+            self.put(doc)
+        return len(missing)
+
+    def pipe(self, texts: Iterable[str], batch_size: int = 100, n_process: int = 1) -> Iterator[Doc]:
+        '''
+        Like nlp.pipe, yielding a Doc for each text in `texts` in order,
+        but reusing cached Docs and caching newly parsed ones.
+        '''
+        texts = list(texts)
+        self.parse_all(texts, batch_size=batch_size, n_process=n_process)
+        for text in texts:
+            yield self.parse(text)
+
+
+@lru_cache()
+def load_docstore() -> DocStore:
+    docstore = DocStore(docstore_dirpath, load_nlp(),
+                        doc_bytes=docstore_doc_bytes, counts_bytes=docstore_counts_bytes)
+    logger.info('Using Doc cache at %s (keeping up to %d bytes of Docs and %d bytes of counts in memory)',
+                docstore.dirpath, docstore_doc_bytes, docstore_counts_bytes)
+    return docstore
+
+
+def parse(text: str) -> Doc:
+    '''
+    Parse `text` with load_nlp(), reusing a previously cached parse if available.
+    '''
+    return load_docstore().parse(text)
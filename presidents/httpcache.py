@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlparse
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # stale entries confirmed unchanged by a 304 Not Modified
+    revalidations: int = 0
+    stores: int = 0
+    evictions: int = 0
+    # compressed bytes read from / written to the cache
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+
+class ResponseCache:
+    '''
+    SQLite-backed cache of response texts, keyed by full URL, stored zlib-compressed.
+
+    An entry is fresh for `host_ttls[host]` seconds after it is stored (or
+    revalidated), falling back to `default_ttl`; a TTL of None never expires.
+    Stale entries are kept, so that their ETag / Last-Modified validators can be
+    used to revalidate them.
+
+    Once the total compressed size exceeds `max_bytes` (if given), the least
+    recently accessed entries are evicted.
+
+    Use path=':memory:' for a cache that lasts only as long as the process.
+    '''
+    def __init__(self, path: str, default_ttl: Optional[float] = None,
+                 host_ttls: Optional[Dict[str, Optional[float]]] = None,
+                 max_bytes: Optional[int] = None, compression_level: int = 6):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.host_ttls = dict(host_ttls or {})
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.stats = ResponseCacheStats()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )''')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        self.nbytes, = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()
+        logger.debug('Opened HTTP response cache at %s (%d bytes)', path, self.nbytes)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.path} ({self.nbytes:,} bytes) {self.stats}>"
+
+    def __len__(self) -> int:
+        with self._lock:
+            count, = self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()
+        return count
+
+    def ttl(self, url: str) -> Optional[float]:
+        return self.host_ttls.get(urlparse(url).netloc, self.default_ttl)
+
+    def is_fresh(self, url: str, response: CachedResponse) -> bool:
+        ttl = self.ttl(url)
+        return ttl is None or time.time() - response.stored_at < ttl
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        '''
+        Return the cached response for `url`, fresh or not, or None.
+        Only fresh responses count as hits.
+        '''
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT etag, last_modified, body, stored_at FROM responses WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._connection.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+        etag, last_modified, body, stored_at = row
+        self.stats.bytes_read += len(body)
+        response = CachedResponse(zlib.decompress(body).decode('utf-8'), etag, last_modified, stored_at)
+        if self.is_fresh(url, response):
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return response
+
+    def put(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        body = zlib.compress(text.encode('utf-8'), self.compression_level)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute('SELECT size FROM responses WHERE url = ?', (url,)).fetchone()
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified, body, len(body), now, now))
+            self.nbytes += len(body) - (row[0] if row else 0)
+            self.stats.stores += 1
+            self.stats.bytes_written += len(body)
+            self._evict()
+
+    def revalidated(self, url: str):
+        '''
+        Mark the entry for `url` as fresh again (after a 304 Not Modified).
+        '''
+        now = time.time()
+        with self._lock:
+            self._connection.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?',
+                                     (now, now, url))
+            self.stats.revalidations += 1
+
+    def _evict(self):
+        if self.max_bytes is None or self.nbytes <= self.max_bytes:
+            return
+        rows = self._connection.execute('SELECT url, size FROM responses ORDER BY accessed_at')
+        evicted = []
+        for url, size in rows:
+            if self.nbytes <= self.max_bytes:
+                break
+            evicted.append((url,))
+            self.nbytes -= size
+        rows.close()
+        self._connection.executemany('DELETE FROM responses WHERE url = ?', evicted)
+        self.stats.evictions += len(evicted)
+        logger.debug('Evicted %d responses from HTTP cache', len(evicted))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,267 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+import json
+import logging
+import mmap
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+try:
+    # orjson decodes (bytes or str) JSON several times faster than json
+    from orjson import loads as fast_loads
+except ImportError:
+    from json import loads as fast_loads
+
+# the name of the module providing fast_loads: "orjson", or "json" if it is not installed
+fast_loads_module = fast_loads.__module__
+
+# (offset, length) of a single line, in bytes
+Span = Tuple[int, int]
+
+
+def iter_line_spans(fp) -> Iterator[Tuple[Span, bytes]]:
+    '''
+    Iterate over ((offset, length), line) for each line in the binary file `fp`
+    '''
+    offset = 0
+    for line in fp:
+        yield (offset, len(line)), line
+        offset += len(line)
+
+
+def _file_signature(path: Path) -> dict:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class LineIndex:
+    '''
+    Persistent mapping from keys to the byte spans of the lines in the
+    line-delimited JSON file at `path` that produced those keys, where each key is
+    `key_func(json.loads(line))`.
+
+    The index is stored next to the data file, at `path` + ".index", as a JSON
+    header line (recording the data file's size and mtime) followed by one
+    "key<TAB>offset<TAB>length" line per record. It is (re)built whenever the
+    header no longer matches the data file.
+    '''
+    def __init__(self, path: Path, key_func: Callable[[dict], str]):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + '.index')
+        self.key_func = key_func
+        self._signature = None
+        self._spans = None
+
+    def _read_index(self, signature: dict) -> Dict[str, List[Span]]:
+        with open(self.index_path) as fp:
+            if json.loads(fp.readline() or 'null') != signature:
+                return None
+            spans = {}
+            for line in fp:
+                key, offset, length = line.rstrip('\n').split('\t')
+                spans.setdefault(key, []).append((int(offset), int(length)))
+            return spans
+
+    def _build_index(self, signature: dict) -> Dict[str, List[Span]]:
+        logger.info('Building index of %s', self.path)
+        spans = {}
+        with open(self.path, 'rb') as fp:
+            for span, line in iter_line_spans(fp):
+                if line.strip():
+                    spans.setdefault(self.key_func(json.loads(line)), []).append(span)
+        # write to a temporary file and then move it into place so that
+        # concurrent readers never see a partially written index
+        tmp_path = self.index_path.with_name(f'{self.index_path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as fp:
+            fp.write(json.dumps(signature))
+            fp.write('\n')
+            for key, key_spans in spans.items():
+                for offset, length in key_spans:
+                    fp.write(f'{key}\t{offset}\t{length}\n')
+        os.replace(tmp_path, self.index_path)
+        logger.info('Wrote index of %d keys to %s', len(spans), self.index_path)
+        return spans
+
+    @property
+    def spans(self) -> Dict[str, List[Span]]:
+        '''
+        Load the index, from memory if the data file is unchanged since the last
+        access, otherwise from disk, (re)building it if it is stale or missing
+        '''
+        signature = _file_signature(self.path)
+        if self._spans is None or signature != self._signature:
+            spans = None
+            if self.index_path.exists():
+                spans = self._read_index(signature)
+            if spans is None:
+                spans = self._build_index(signature)
+            self._signature, self._spans = signature, spans
+        return self._spans
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.spans
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def read(self, keys: Iterable[str]) -> Iterator[dict]:
+        '''
+        Iterate over the records for the given keys (in file order, skipping
+        unknown keys), seeking directly to each one via mmap.
+        '''
+        all_spans = self.spans
+        spans = sorted(span for key in set(keys) for span in all_spans.get(key, ()))
+        if not spans:
+            return
+        with open(self.path, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset, length in spans:
+                yield json.loads(mm[offset:offset + length])
+
+
+@lru_cache(maxsize=16)
+def _map_file(path: str, signature: Tuple[int, int]) -> mmap.mmap:
+    # `signature` (size, mtime_ns) only keys the cache, so that a rewritten file is mapped afresh
+    with open(path, 'rb') as fp:
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _open_lazy_text(path: str, start: int, end: int) -> 'LazyText':
+    stat = os.stat(path)
+    return LazyText(path, _map_file(path, (stat.st_size, stat.st_mtime_ns)), start, end)
+
+
+class LazyText:
+    '''
+    Reference to the (still JSON-escaped) contents of a string, without its
+    quotes, at buffer[start:end], where `buffer` maps the file at `path`,
+    that is only decoded when asked for.
+
+    LazyTexts compare (and hash) by their span of the file, without decoding it,
+    and pickle as just that span; unpickling maps the file again.
+    '''
+    __slots__ = ('path', 'buffer', 'start', 'end')
+
+    def __init__(self, path: str, buffer: Union[bytes, mmap.mmap], start: int, end: int):
+        self.path = path
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.path}[{self.start}:{self.end}]>"
+
+    def __reduce__(self):
+        return _open_lazy_text, (self.path, self.start, self.end)
+
+    def __eq__(self, other):
+        if not isinstance(other, LazyText):
+            return NotImplemented
+        return (self.path, self.start, self.end) == (other.path, other.start, other.end)
+
+    def __hash__(self):
+        return hash((self.path, self.start, self.end))
+
+    def __len__(self) -> int:
+        '''
+        Length of the encoded string, in bytes
+        '''
+        return self.end - self.start
+
+    def __str__(self) -> str:
+        return fast_loads(b'"' + self.buffer[self.start:self.end] + b'"')
+
+
+def _find_string_end(buffer, start: int, end: int) -> int:
+    '''
+    Return the position of the closing quote of the JSON string whose contents
+    begin at buffer[start], looking no further than `end`, or -1 if there is none.
+    '''
+    # hopping between quotes with find is far faster than matching the whole
+    # string with a regex, since escaped quotes are rare in speech texts
+    position = buffer.find(b'"', start, end)
+    while position != -1:
+        # the quote is escaped if preceded by an odd number of backslashes
+        n_backslashes = 0
+        while buffer[position - n_backslashes - 1] == 0x5c:  # backslash
+            n_backslashes += 1
+        if n_backslashes % 2 == 0:
+            return position
+        position = buffer.find(b'"', position + 1, end)
+    return position
+
+
+# a (possibly unterminated) JSON string, or a bracket
+_structure_regex = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*("?)|[\[\]{}]')
+
+
+def _is_top_level(buffer, start: int, end: int) -> bool:
+    '''
+    Whether buffer[end] (in the JSON line starting at buffer[start]) is directly
+    within the outermost object, i.e., neither nested nor inside a string.
+    '''
+    depth = 0
+    for match in _structure_regex.finditer(buffer, start, end):
+        token = match.group()
+        if token[:1] == b'"':
+            if not match.group(1):
+                return False
+        elif token in (b'{', b'['):
+            depth += 1
+        else:
+            depth -= 1
+    return depth == 1
+
+
+def iter_lazy_records(path: Path, lazy_key: str = 'text') -> Iterator[dict]:
+    '''
+    Iterate over the records in the line-delimited JSON file at `path`,
+    decoding everything but the (string) value of `lazy_key`, which is
+    replaced by a LazyText pointing into the mmap'd file instead.
+
+    The map stays open as long as any of those LazyTexts is alive.
+    Records whose `lazy_key` is not a top-level string are decoded in full.
+    '''
+    path = os.path.abspath(path)
+    key_regex = re.compile(rb'"' + re.escape(json.dumps(lazy_key).encode('utf-8')[1:-1]) + rb'"\s*:\s*"')
+    with open(path, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return
+        mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    offset = 0
+    size = len(mm)
+    while offset < size:
+        line_end = mm.find(b'\n', offset)
+        if line_end == -1:
+            line_end = size
+        # skip over matches of the key in nested objects (or inside strings)
+        match = key_regex.search(mm, offset, line_end)
+        while match and not _is_top_level(mm, offset, match.start()):
+            match = key_regex.search(mm, match.end(), line_end)
+        text_end = _find_string_end(mm, match.end(), line_end) if match else -1
+        if text_end != -1:
+            # decode the line with the text cut out, leaving an empty string in its place
+            record = fast_loads(mm[offset:match.end()] + mm[text_end:line_end])
+            if record.get(lazy_key) == '':
+                record[lazy_key] = LazyText(path, mm, match.end(), text_end)
+                yield record
+            else:
+                # e.g., a duplicate key; take the slow road
+                yield fast_loads(mm[offset:line_end])
+        elif mm[offset:line_end].strip():
+            yield fast_loads(mm[offset:line_end])
+        offset = line_end + 1
+
+
+def read_lazy_speeches(path: Path) -> Iterator:
+    '''
+    Iterate over the speech records in the line-delimited JSON file at `path`
+    as Speech instances whose text is only decoded when accessed, via
+    iter_lazy_records(path); see LazySpeech.
+    '''
+    from presidents.models.speech import LazySpeech, Speech
+    for record in iter_lazy_records(path, 'text'):
+        cls = LazySpeech if isinstance(record['text'], LazyText) else Speech
+        yield cls.from_json(**record)
@@ -0,0 +1,93 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+import glob
+import logging
+import time
+
+from presidents.ldjson import fast_loads, fast_loads_module
+
+logger = logging.getLogger(__name__)
+
+PathOrGlob = Union[str, Path]
+
+
+def expand_paths(paths: Iterable[PathOrGlob]) -> List[Path]:
+    '''
+    Expand each of `paths` that is a glob pattern into the (sorted) paths it matches,
+    dropping duplicates
+    '''
+    expanded = {}
+    for path in paths:
+        path = str(path)
+        if glob.has_magic(path):
+            matches = sorted(glob.glob(path, recursive=True))
+            if not matches:
+                logger.warning('No files match %s', path)
+        else:
+            matches = [path]
+        for match in matches:
+            expanded.setdefault(Path(match), None)
+    return list(expanded)
+
+
+def iter_records(path: Path) -> Iterator[dict]:
+    '''
+    Iterate over the speech records (as accepted by Speech.from_json) in the file
+    at `path`: line-delimited JSON, or, if named *.json.gz, tweets (see twitter.read_tweet_file)
+    '''
+    if Path(path).name.endswith('.json.gz'):
+        from presidents.twitter import read_tweet_file
+        yield from read_tweet_file(path)
+        return
+    with open(path, 'rb') as fp:
+        for line in fp:
+            if line.strip():
+                yield fast_loads(line)
+
+
+def _load_speeches(path: Path) -> list:
+    from presidents.models import Speech
+    return [Speech.from_json(**record) for record in iter_records(path)]
+
+
+def _load_frame(path: Path):
+    import pandas as pd
+    from presidents.util import load_tzinfos, parse_dates
+    frame = pd.DataFrame.from_records(list(iter_records(path)))
+    if 'timestamp' in frame:
+        frame['timestamp'] = parse_dates(frame['timestamp'], load_tzinfos()['EST'])
+    # use nullable integers, so that (e.g.) tweet ids are not rounded to floats
+    # when concatenated with frames lacking them
+    for column in frame.select_dtypes('integer'):
+        frame[column] = frame[column].astype('Int64')
+    return frame
+
+
+def load_speeches(paths: Iterable[PathOrGlob], frame: bool = False, max_workers: Optional[int] = None):
+    '''
+    Load all the speech records from `paths` (files or glob patterns; see iter_records),
+    reading and decoding the files in parallel across `max_workers` processes
+    (one per CPU if None; 1 to load them in this process).
+
+    Returns a list of Speech instances (in file and line order), or, if `frame` is True,
+    a DataFrame with one row per record and one column per field, where "timestamp"
+    is a datetime64 column in (naive) UTC, as parsed by util.parse_dates.
+    '''
+    paths = expand_paths(paths)
+    load = _load_frame if frame else _load_speeches
+    started = time.perf_counter()
+    if max_workers == 1 or len(paths) <= 1:
+        results = [load(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            results = list(executor.map(load, paths))
+    if frame:
+        import pandas as pd
+        loaded = pd.concat(results, ignore_index=True, sort=False) if results else pd.DataFrame()
+    else:
+        loaded = [speech for speeches in results for speech in speeches]
+    elapsed = time.perf_counter() - started
+    logger.info('Loaded %d records from %d files in %.2fs (%.0f records/s, decoding with %s)',
+                len(loaded), len(paths), elapsed, len(loaded) / elapsed if elapsed else 0, fast_loads_module)
+    return loaded
@@ -1,3 +1,29 @@
-from .group import Group
-from .speech import Speech
-from .synset import Synset, synset_stats, all_synset_stats
+import importlib
+
+# the submodule defining each of the names this package exports; each is only
+# imported on first access, so that e.g. `from presidents.models import Speech`
+# does not have to import pandas and scipy
+_exports = {
+    'Corpus': 'corpus',
+    'Group': 'group',
+    'DocumentTermMatrix': 'matrix',
+    'LazySpeech': 'speech',
+    'Speech': 'speech',
+    'Synset': 'synset',
+    'synset_stats': 'synset',
+    'all_synset_stats': 'synset',
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_exports[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_exports})
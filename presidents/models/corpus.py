@@ -0,0 +1,144 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import cytoolz as toolz
+import numpy as np
+
+from presidents.util import slugify
+from .group import Group
+from .speech import Speech
+
+# attributes of Speech that can be indexed directly; any other name is looked up in speech.metadata
+_speech_attributes = ('title', 'author', 'source')
+
+
+def _attribute_getter(name: str) -> Callable[[Speech], Any]:
+    if name in _speech_attributes:
+        return lambda speech: getattr(speech, name)
+    return lambda speech: speech.metadata.get(name)
+
+
+@dataclass(frozen=True)
+class Corpus:
+    '''
+    Collection of speeches that can be filtered without scanning all of them.
+
+    Equality criteria on an attribute (author, title, source, or any metadata key,
+    e.g., category or datapath) are looked up in a {value: positions} index, built
+    on first use of that attribute; timestamp ranges are bisected in a sorted array
+    of timestamps. Arbitrary predicates are only applied to the speeches that pass
+    those criteria.
+    '''
+    speeches: Sequence[Speech] = ()
+    # positions (in corpus order) of the speeches having each value, for each indexed attribute
+    _indexes: Dict[str, Dict[Hashable, np.ndarray]] = field(
+        init=False, repr=False, compare=False, default_factory=dict)
+    # timestamps of the speeches that have one, in ascending order, and their positions
+    _timestamps: List[datetime] = field(init=False, repr=False, compare=False, default_factory=list)
+    _timestamp_positions: np.ndarray = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        speeches = tuple(self.speeches)
+        object.__setattr__(self, 'speeches', speeches)
+        dated = sorted(((speech.timestamp, i) for i, speech in enumerate(speeches)
+                        if speech.timestamp is not None), key=toolz.first)
+        self._timestamps.extend(timestamp for timestamp, _ in dated)
+        object.__setattr__(self, '_timestamp_positions',
+                           np.array([i for _, i in dated], dtype=np.int64))
+        self.index('author')
+
+    def __iter__(self):
+        return iter(self.speeches)
+
+    def __len__(self):
+        return len(self.speeches)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} ({len(self)} speeches)>"
+
+    def index(self, name: str) -> Dict[Hashable, np.ndarray]:
+        '''
+        Return the {value: positions} index of attribute `name`, building it if needed.
+        '''
+        index = self._indexes.get(name)
+        if index is None:
+            getter = _attribute_getter(name)
+            positions = {}
+            for i, speech in enumerate(self.speeches):
+                positions.setdefault(getter(speech), []).append(i)
+            index = {value: np.array(value_positions, dtype=np.int64)
+                     for value, value_positions in positions.items()}
+            self._indexes[name] = index
+        return index
+
+    def values(self, name: str) -> List[Hashable]:
+        '''
+        Return the distinct values of attribute `name`, most common first.
+        '''
+        index = self.index(name)
+        return sorted(index, key=lambda value: len(index[value]), reverse=True)
+
+    def _equal_positions(self, name: str, value: Any) -> np.ndarray:
+        index = self.index(name)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            # any of several values
+            matches = [index[v] for v in value if v in index]
+            return np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int64)
+        return index.get(value, np.empty(0, dtype=np.int64))
+
+    def _time_positions(self, start: Optional[datetime], end: Optional[datetime]) -> np.ndarray:
+        lo = 0 if start is None else bisect_left(self._timestamps, start)
+        hi = len(self._timestamps) if end is None else bisect_left(self._timestamps, end)
+        return np.sort(self._timestamp_positions[lo:hi])
+
+    def positions(
+        self,
+        *,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        predicates: Iterable[Callable[[Speech], bool]] = (),
+        **criteria,
+    ) -> np.ndarray:
+        '''
+        Return the (ascending) positions of the speeches matching all of `criteria`
+        ({attribute: value, or collection of alternative values}), timestamped in
+        [start, end) (if either is given), and satisfying all of `predicates`.
+        '''
+        candidates: List[np.ndarray] = [self._equal_positions(name, value) for name, value in criteria.items()]
+        if start is not None or end is not None:
+            candidates.append(self._time_positions(start, end))
+        if candidates:
+            # intersect the smallest sets first
+            candidates.sort(key=len)
+            positions = candidates[0]
+            for other in candidates[1:]:
+                positions = np.intersect1d(positions, other, assume_unique=True)
+        else:
+            positions = np.arange(len(self.speeches), dtype=np.int64)
+        predicates = list(predicates)
+        if predicates:
+            predicate = toolz.compose(all, toolz.juxt(predicates))
+            positions = np.array([i for i in positions.tolist() if predicate(self.speeches[i])], dtype=np.int64)
+        return positions
+
+    def select(self, **kwargs) -> List[Speech]:
+        '''
+        Like positions(...), but returning the speeches themselves, in corpus order.
+        '''
+        return [self.speeches[i] for i in self.positions(**kwargs).tolist()]
+
+    def group(self, name: str, slug: Optional[str] = None, **kwargs) -> Group:
+        '''
+        Collect the speeches matching select(...) into a Group.
+        '''
+        return Group(name, slug or slugify(name), self.select(**kwargs))
+
+    def time_range(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        '''
+        Return the earliest and latest timestamp in this corpus (or None, None if it has none).
+        '''
+        if not self._timestamps:
+            return None, None
+        return self._timestamps[0], self._timestamps[-1]
@@ -1,17 +1,37 @@
-from dataclasses import dataclass
-from typing import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Mapping, Optional, Pattern, Union
 
 import cytoolz as toolz
+import numpy as np
+import pandas as pd
 
 from presidents.util import slugify
+from .matrix import DocumentTermMatrix
 from .speech import Speech
 
+if TYPE_CHECKING:
+    from presidents.text import MultiPattern
+
+
+@dataclass
+class _WordCountSums:
+    '''
+    Running total of the word counts of a group's first `n_speeches` speeches,
+    with `totals[vocabulary[term]]` the count of `term`
+    '''
+    vocabulary: Dict[str, int] = field(default_factory=dict)
+    totals: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    n_speeches: int = 0
+
 
 @dataclass(frozen=True)
 class Group:
     name: str
     slug: str
     speeches: Iterable[Speech] = ()
+    # running sums for count_words_by, by attr_id
+    _word_count_sums: Dict[int, _WordCountSums] = field(
+        init=False, repr=False, compare=False, default_factory=dict)
 
     def __iter__(self):
         return iter(self.speeches)
@@ -32,3 +52,92 @@ class Group:
     ):
         predicate = toolz.compose(all, toolz.juxt(predicates))
         return cls(name, slug or slugify(name), list(filter(predicate, speeches)))
+
+    def append(self, speech: Speech):
+        self.extend([speech])
+
+    def extend(self, speeches: Iterable[Speech]):
+        '''
+        Add `speeches` to the end of this group (turning its speeches into a list,
+        if not one already). Word counts computed so far are kept, and only the
+        new speeches' counts are added to them when next requested.
+        '''
+        if not isinstance(self.speeches, list):
+            object.__setattr__(self, 'speeches', list(self.speeches))
+        self.speeches.extend(speeches)
+
+    def parse_all(self, batch_size: int = 100, n_process: int = 1) -> int:
+        '''
+        Parse (and cache) the Doc of every speech in this group in batches via
+        nlp.pipe, optionally across multiple processes, so that subsequent
+        `speech.doc` accesses are cache hits.
+
+        Returns the number of speeches that had to be parsed.
+        '''
+        from presidents.docstore import load_docstore
+        docstore = load_docstore()
+        texts = (speech.text for speech in self.speeches)
+        return docstore.parse_all(texts, batch_size=batch_size, n_process=n_process)
+
+    def document_term_matrix(
+        self,
+        attr_id: Optional[int] = None,
+        vocabulary: Optional[Dict[str, int]] = None,
+    ) -> DocumentTermMatrix:
+        '''
+        Build a sparse (speech x term) matrix of this group's word counts by `attr_id`
+        (e.g., ORTH, LOWER (the default), or LEMMA), optionally over a `vocabulary`
+        shared with other groups.
+        '''
+        return DocumentTermMatrix.from_speeches(self.speeches, attr_id, vocabulary)
+
+    def count_patterns(self, patterns: Union['MultiPattern', Mapping[str, Union[str, Pattern]]]) -> pd.DataFrame:
+        '''
+        Count the matches of each of the named `patterns` in each speech's text,
+        each pattern independently of the others (see MultiPattern).
+
+        Returns a (speech x pattern) DataFrame indexed by (author, title, timestamp).
+        '''
+        from presidents.text import MultiPattern, count_pattern_matches
+        if not isinstance(patterns, MultiPattern):
+            patterns = MultiPattern(patterns)
+        counts = count_pattern_matches((speech.text for speech in self.speeches), patterns)
+        index = pd.MultiIndex.from_tuples(
+            [(speech.author, speech.title, speech.timestamp) for speech in self.speeches],
+            names=['author', 'title', 'timestamp'])
+        return pd.DataFrame(counts, index=index, columns=pd.Index(patterns.names, name='pattern'))
+
+    def _update_word_count_sums(self, attr_id: int) -> _WordCountSums:
+        sums = self._word_count_sums.setdefault(attr_id, _WordCountSums())
+        new_speeches = self.speeches[sums.n_speeches:]
+        if new_speeches:
+            dtm = DocumentTermMatrix.from_speeches(new_speeches, attr_id, sums.vocabulary)
+            totals = np.zeros(len(sums.vocabulary), dtype=np.int64)
+            totals[:len(sums.totals)] = sums.totals
+            totals += np.asarray(dtm.counts.sum(axis=0)).ravel()
+            sums.totals = totals
+            sums.n_speeches += len(new_speeches)
+        return sums
+
+    def count_words_by(self, attr_id: Optional[int] = None) -> Dict[str, int]:
+        '''
+        Count the words of all of this group's speeches by `attr_id` (spacy.attrs.ORTH
+        if None), by summing each speech's (cached) count_words_by(attr_id), rather
+        than parsing their merged texts.
+
+        The sums are kept, so that later calls only count speeches added since.
+        '''
+        if attr_id is None:
+            import spacy.attrs
+            attr_id = spacy.attrs.ORTH
+        sums = self._update_word_count_sums(attr_id)
+        terms = list(sums.vocabulary)
+        return {terms[i]: int(sums.totals[i]) for i in np.flatnonzero(sums.totals)}
+
+    def freq_words_by(self, attr_id: Optional[int] = None) -> Dict[str, float]:
+        '''
+        Like `count_words_by`, but normalized so that all values sum to 1.
+        '''
+        counts = self.count_words_by(attr_id)
+        total = sum(counts.values())
+        return {term: count / total for term, count in counts.items()}
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from scipy import sparse
+import numpy as np
+import pandas as pd
+
+from .speech import Speech
+
+
+@dataclass(frozen=True)
+class DocumentTermMatrix:
+    '''
+    Sparse matrix of word counts, with one row per speech and one column per term.
+
+    `rows` holds each speech's metadata (title, author, timestamp), in row order.
+    Matrices built with the same `vocabulary` dict share column indices
+    (though later ones may have more columns).
+    '''
+    counts: sparse.csr_matrix
+    terms: List[str]
+    rows: pd.DataFrame
+
+    @classmethod
+    def from_counts(
+        cls,
+        counts: Iterable[Mapping[str, int]],
+        rows: pd.DataFrame,
+        vocabulary: Optional[Dict[str, int]] = None,
+    ):
+        '''
+        Build from per-row {term: count} mappings, assigning column indices to
+        new terms in order of appearance, by extending `vocabulary` (in place), if given.
+        '''
+        if vocabulary is None:
+            vocabulary = {}
+        indptr = [0]
+        indices = []
+        data = []
+        for row_counts in counts:
+            for term, count in row_counts.items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                data.append(count)
+            indptr.append(len(indices))
+        shape = (len(indptr) - 1, len(vocabulary))
+        matrix = sparse.csr_matrix((np.array(data, dtype=np.int64),
+                                    np.array(indices, dtype=np.int64),
+                                    np.array(indptr, dtype=np.int64)), shape=shape)
+        terms = sorted(vocabulary, key=vocabulary.get)
+        return cls(matrix, terms, rows)
+
+    @classmethod
+    def from_speeches(
+        cls,
+        speeches: Iterable[Speech],
+        attr_id: Optional[int] = None,
+        vocabulary: Optional[Dict[str, int]] = None,
+    ):
+        '''
+        Build from each speech's (cached) count_words_by(attr_id),
+        where attr_id defaults to spacy.attrs.LOWER.
+        '''
+        if attr_id is None:
+            import spacy.attrs
+            attr_id = spacy.attrs.LOWER
+        speeches = list(speeches)
+        rows = pd.DataFrame({
+            'title': [speech.title for speech in speeches],
+            'author': [speech.author for speech in speeches],
+            'timestamp': [speech.timestamp for speech in speeches],
+        })
+        counts = (speech.count_words_by(attr_id) for speech in speeches)
+        return cls.from_counts(counts, rows, vocabulary)
+
+    def __len__(self):
+        return self.counts.shape[0]
+
+    def __repr__(self):
+        n_rows, n_terms = self.counts.shape
+        return f"<{type(self).__name__} {n_rows} rows x {n_terms} terms ({self.counts.nnz} nonzero)>"
+
+    @property
+    def vocabulary(self) -> Dict[str, int]:
+        return {term: i for i, term in enumerate(self.terms)}
+
+    def columns(self, terms: Iterable[str]) -> np.ndarray:
+        '''
+        Return the (unique, sorted) column indices of those `terms` present in this matrix.
+        '''
+        vocabulary = self.vocabulary
+        return np.array(sorted({vocabulary[term] for term in terms if term in vocabulary}), dtype=np.int64)
+
+    def totals(self) -> np.ndarray:
+        '''
+        Return the total number of words in each row.
+        '''
+        return np.asarray(self.counts.sum(axis=1)).ravel()
+
+    def frequencies(self) -> sparse.csr_matrix:
+        '''
+        Return the counts matrix, with each row normalized to sum to 1.
+        '''
+        totals = self.totals().astype(np.float64)
+        totals[totals == 0] = 1.0
+        return sparse.diags(1.0 / totals) @ self.counts
+
+    def count_words(self) -> Dict[str, int]:
+        '''
+        Sum counts over all rows, like text.count_words_by on all the speeches combined.
+        '''
+        column_sums = np.asarray(self.counts.sum(axis=0)).ravel()
+        return {self.terms[i]: int(column_sums[i]) for i in np.flatnonzero(column_sums)}
+
+    def freq_words(self) -> Dict[str, float]:
+        '''
+        Like `count_words`, but normalized so that all values sum to 1.
+        '''
+        counts = self.count_words()
+        total = sum(counts.values())
+        return {term: count / total for term, count in counts.items()}
@@ -1,13 +1,12 @@
 from dataclasses import dataclass
 from datetime import datetime
-from functools import lru_cache
-from typing import Dict, Mapping
+from typing import TYPE_CHECKING, Dict, Mapping, Optional
 
-import spacy
-from spacy.tokens import Doc
+from presidents.util import parse_date, load_tzinfos, elide, hashabledict
 
-from presidents.text import load_nlp, count_words_by
-from presidents.util import parse_date, tzinfos, elide, hashabledict
+if TYPE_CHECKING:
+    from spacy.tokens import Doc
+    from presidents.ldjson import LazyText
 
 
 @dataclass(frozen=True)
@@ -32,7 +31,7 @@ class Speech:
 
     @classmethod
     def from_json(cls, title: str, author: str, text: str, source: str, timestamp: str, **metadata):
-        timestamp = parse_date(timestamp, tzinfos['EST'])
+        timestamp = parse_date(timestamp, load_tzinfos()['EST'])
         metadata = hashabledict(metadata)
         return cls(title, author, text, source, timestamp, metadata)
 
@@ -46,12 +45,67 @@ class Speech:
             **self.metadata,
         }
 
+    # spaCy is only imported once a speech is actually parsed, so that loading
+    # speeches (and importing this module) stays fast
+
+    @property
+    def doc(self) -> 'Doc':
+        from presidents.docstore import load_docstore
+        return load_docstore().parse(self.text)
+
+    def count_words_by(self, attr_id: Optional[int] = None) -> Dict[str, int]:
+        '''
+        Count this speech's words by `attr_id` (spacy.attrs.ORTH if None).
+        '''
+        from presidents.docstore import load_docstore
+        import spacy.attrs
+        return load_docstore().count_words_by(self.text, spacy.attrs.ORTH if attr_id is None else attr_id)
+
+
+class LazySpeech(Speech):
+    '''
+    Speech whose text is a reference (e.g., a LazyText into an mmap'd ldjson file,
+    as produced by ldjson.read_lazy_speeches) that is decoded on each access of
+    `text` (or `doc`, etc.), and never kept, so that a large catalogue of speeches
+    takes little more memory than their metadata. Likewise, LazySpeeches compare,
+    hash, and pickle by that reference rather than the decoded text.
+    '''
+    def __init__(self, title: str, author: str, text: 'LazyText', source: str, timestamp: datetime,
+                 metadata: Mapping):
+        object.__setattr__(self, 'title', title)
+        object.__setattr__(self, 'author', author)
+        object.__setattr__(self, '_text', text)
+        object.__setattr__(self, 'source', source)
+        object.__setattr__(self, 'timestamp', timestamp)
+        object.__setattr__(self, 'metadata', metadata)
+
     @property
-    @lru_cache()
-    def doc(self) -> Doc:
-        nlp = load_nlp()
-        return nlp(self.text)
-
-    @lru_cache()
-    def count_words_by(self, attr_id: int = spacy.attrs.ORTH) -> Dict[str, int]:
-        return count_words_by(self.doc, attr_id)
+    def text(self) -> str:
+        return str(self._text)
+
+    def _fields(self) -> tuple:
+        # like the dataclass' own comparison, but with the reference instead of the decoded text
+        return (self.title, self.author, self._text, self.source, self.timestamp, self.metadata)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __reduce__(self):
+        # a LazyText pickles as its path and span, not its (mmap'd) buffer
+        return type(self), self._fields()
+
+    def __repr__(self):
+        contents = [
+            f"title={self.title!r}",
+            f"author={self.author!r}",
+            f"text={self._text!r}",
+            f"source={self.source!r}",
+            f"timestamp={self.timestamp!r}",
+            self.metadata and f"metadata={self.metadata!r}",
+        ]
+        return f"{type(self).__name__}({', '.join(filter(None, contents))})"
@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from typing import Container, Iterable, Iterator
+from typing import Container, Dict, Iterable, Iterator
 
-import spacy.attrs
+from scipy import sparse
+import numpy as np
+import pandas as pd
 
 from .group import Group
+from .matrix import DocumentTermMatrix
 
 
 @dataclass(frozen=True)
@@ -25,29 +28,75 @@ def synset_stats(
     group: Group,
     synset: Synset,
 ) -> Iterator[dict]:
-    for speech in group.speeches:
-        speech_counts = speech.count_words_by(spacy.attrs.LOWER)
-        # number of synset matches in speech
-        n_matches = sum(
-            count
-            for value, count in speech_counts.items()
-            if value in synset.values
-        )
-        # total number of words in speech
-        n_total = sum(speech_counts.values())
+    dtm = group.document_term_matrix()
+    # number of synset matches in each speech
+    n_matches = np.asarray(dtm.counts[:, dtm.columns(synset.values)].sum(axis=1)).ravel()
+    # total number of words in each speech
+    n_total = dtm.totals()
+    for speech_n_matches, speech_n_total in zip(n_matches.tolist(), n_total.tolist()):
         yield {
             "group": group.name,
             "synset": synset.name,
-            "n_matches": n_matches,
-            "n_total": n_total,
-            "proportion": n_matches / n_total,
+            "n_matches": speech_n_matches,
+            "n_total": speech_n_total,
+            "proportion": speech_n_matches / speech_n_total,
         }
 
 
+def synset_matrix(synsets: Iterable[Synset], vocabulary: Dict[str, int]) -> sparse.csr_matrix:
+    '''
+    Build a sparse (term x synset) indicator matrix, with a 1 wherever the
+    term (as indexed by `vocabulary`) is one of the synset's values.
+    '''
+    synsets = list(synsets)
+    rows = []
+    columns = []
+    for j, synset in enumerate(synsets):
+        synset_rows = {vocabulary[value] for value in synset.values if value in vocabulary}
+        rows.extend(synset_rows)
+        columns.extend([j] * len(synset_rows))
+    data = np.ones(len(rows), dtype=np.int64)
+    return sparse.csr_matrix((data, (rows, columns)), shape=(len(vocabulary), len(synsets)))
+
+
 def all_synset_stats(
     groups: Iterable[Group],
     synsets: Iterable[Synset],
-) -> Iterator[dict]:
-    for group in groups:
-        for synset in synsets:
-            yield from synset_stats(group, synset)
+) -> pd.DataFrame:
+    '''
+    Compute synset_stats for every combination of group and synset, in the same
+    order, as a single DataFrame, via one (speech x term) by (term x synset)
+    sparse matrix product.
+
+    Unlike synset_stats, a speech with no words gets a NaN proportion.
+    '''
+    groups = list(groups)
+    synsets = list(synsets)
+    speeches = [speech for group in groups for speech in group.speeches]
+    dtm = DocumentTermMatrix.from_speeches(speeches)
+    # n_matches[i, j] is the number of matches of synset j in speech i
+    n_matches = (dtm.counts @ synset_matrix(synsets, dtm.vocabulary)).toarray()
+    n_total = dtm.totals()
+
+    def iter_group_frames():
+        offset = 0
+        for group in groups:
+            n_speeches = len(group.speeches)
+            group_n_matches = n_matches[offset:offset + n_speeches]
+            group_n_total = n_total[offset:offset + n_speeches]
+            offset += n_speeches
+            # order by synset, then speech, like synset_stats
+            yield pd.DataFrame({
+                "group": group.name,
+                "synset": np.repeat([synset.name for synset in synsets], n_speeches),
+                "n_matches": group_n_matches.T.ravel(),
+                "n_total": np.tile(group_n_total, len(synsets)),
+            })
+
+    group_frames = list(iter_group_frames())
+    if not group_frames:
+        # like the original generator, no groups means no rows
+        group_frames = [pd.DataFrame(columns=["group", "synset", "n_matches", "n_total"])]
+    df = pd.concat(group_frames, ignore_index=True)
+    df["proportion"] = df.n_matches / df.n_total.where(df.n_total > 0)
+    return df
@@ -1,31 +1,109 @@
 import argparse
 import json
 import logging
+import os
 import sys
 
-from cytoolz import unique
-
+from presidents import scraping
 from . import abcnews, cbsnews, cspan, millercenter, tapp, whitehouse
 
 logger = logging.getLogger(__name__)
 
+
+def _map_args(func, source_url=None):
+    '''
+    Create a command that applies `func` to each of the command's args,
+    concurrently according to opts.jobs and opts.ordered, skipping those args
+    whose `source_url(arg)` has already been scraped (is in opts.done)
+    '''
+    def command(opts):
+        args = opts.args
+        if source_url is not None:
+            args = [arg for arg in args if source_url(arg) not in opts.done]
+            logger.info('Skipping %d of %d args already scraped', len(opts.args) - len(args), len(opts.args))
+        return scraping.map_concurrently(func, args, opts.jobs, opts.ordered)
+    return command
+
+
 # each command should be a function from an argparse opts object to an iterable
 # of standard speech dicts
 commands = {
-    'abcnews': lambda opts: (abcnews.fetch(page_url) for page_url in opts.args),
-    'cbsnews': lambda opts: (cbsnews.fetch(page_url) for page_url in opts.args),
-    'cspan': lambda opts: (cspan.fetch(program_id) for program_id in opts.args),
-    'millercenter': lambda opts: millercenter.fetch_speeches(),
-    'tapp-fetch': lambda opts: (tapp.fetch(pid) for pid in opts.args),
+    'abcnews': _map_args(abcnews.fetch, abcnews.source_url),
+    'cbsnews': _map_args(cbsnews.fetch, cbsnews.source_url),
+    'cspan': _map_args(cspan.fetch, cspan.source_url),
+    'millercenter': lambda opts: millercenter.fetch_speeches(opts.jobs, opts.ordered, opts.done),
+    'tapp-fetch': _map_args(tapp.fetch, tapp.source_url),
     'tapp-read': lambda opts: tapp.read_from_local_cache(opts.args),
-    'tapp-inaugurals': lambda opts: tapp.fetch_inaugurals(),
+    'tapp-inaugurals': lambda opts: tapp.fetch_inaugurals(opts.jobs),
     'tapp-election-pids': lambda opts: map(int, tapp.fetch_election_pids(*opts.args)),
     'tapp-transition-pids': lambda opts: map(int, tapp.fetch_transition_pids(*opts.args)),
-    'tapp-pids': lambda opts: unique(map(int, tapp.fetch_pids(dict(arg.split('=') for arg in opts.args)))),
-    'whitehouse': lambda opts: whitehouse.fetch_all(opts.args),
+    'tapp-pids': lambda opts: map(int, tapp.fetch_pids(dict(arg.split('=') for arg in opts.args),
+                                                       opts.partition, opts.jobs)),
+    'whitehouse': lambda opts: whitehouse.fetch_all(opts.args, opts.jobs, opts.ordered, opts.done),
 }
 
 
+def _record_key(obj):
+    '''
+    Identify an output record: standard speech dicts by their source url, and
+    anything else (e.g., pids) by its JSON representation
+    '''
+    if isinstance(obj, dict) and 'source' in obj:
+        return obj['source']
+    return json.dumps(obj, sort_keys=True)
+
+
+def _load_checkpoint(path):
+    '''
+    Return the keys of the complete records previously written to `path`,
+    truncating the partial record that an interrupted run may have left at the end
+    '''
+    keys = set()
+    if not os.path.exists(path):
+        return keys
+    with open(path, 'rb+') as fp:
+        end = 0
+        for line in fp:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                keys.add(_record_key(json.loads(line)))
+            except ValueError:
+                break
+            end += len(line)
+        size = fp.seek(0, os.SEEK_END)
+        if end < size:
+            logger.warning('Truncating %d bytes of incomplete output at the end of %s', size - end, path)
+            fp.truncate(end)
+    return keys
+
+
+def _write_batches(objs, fp, batch_size=1, sync=False):
+    '''
+    Write each of `objs` as a line of JSON to `fp`, in batches of `batch_size`
+    records, each written all at once and flushed (and synced to disk, if
+    `sync`), so that an interrupted run leaves at most one partial record behind.
+    '''
+    batch = []
+
+    def write_batch():
+        fp.write(''.join(batch))
+        fp.flush()
+        if sync:
+            os.fsync(fp.fileno())
+        batch.clear()
+
+    try:
+        for obj in objs:
+            batch.append(json.dumps(obj, sort_keys=True, ensure_ascii=False) + '\n')
+            if len(batch) >= batch_size:
+                write_batch()
+    finally:
+        # save whatever was completed, even if the run is failing
+        if batch:
+            write_batch()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Scrape major news outlet articles',
@@ -34,6 +112,32 @@ def main():
                         help='log extra information (repeat for even more, up to 3)')
     # (none) => WARNING, -v => INFO, -vv => DEBUG, -vvv => NOTSET
     verbosity_levels = [logging.WARNING, logging.INFO, logging.DEBUG, logging.NOTSET]  # [30, 20, 10, 0]
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of pages to fetch concurrently')
+    parser.add_argument('--unordered', dest='ordered', action='store_false',
+                        help='emit results as they complete, rather than in input order')
+    parser.add_argument('--max-per-host', type=int, default=scraping.throttle.max_concurrency,
+                        help='maximum number of concurrent requests to any one host')
+    parser.add_argument('--delay', type=float, default=scraping.throttle.delay,
+                        help='minimum number of seconds between starting requests to the same host')
+    parser.add_argument('--cache', default=scraping.http_cache_filepath,
+                        help='path of the HTTP response cache (SQLite database)')
+    parser.add_argument('--no-cache', dest='cache', action='store_const', const=None,
+                        help='do not cache HTTP responses')
+    parser.add_argument('--cache-ttl', type=float,
+                        help='number of seconds cached responses stay fresh (default: forever)')
+    parser.add_argument('--cache-host-ttl', action='append', default=[], metavar='HOST=SECONDS',
+                        help='number of seconds cached responses from HOST stay fresh (repeatable)')
+    parser.add_argument('--cache-max-bytes', type=int,
+                        help='evict least recently used responses beyond this total compressed size')
+    parser.add_argument('--restricted-parse', dest='restricted_parsing', action='store_true',
+                        help='build only the elements of each page that the scraper reads, not the whole HTML tree')
+    parser.add_argument('-o', '--output',
+                        help='write records to this file instead of stdout')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip sources already in --output (from an earlier, interrupted run) and append to it')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='number of records to write (and sync) at a time')
 
     # set up commands
     subparsers = parser.add_subparsers(dest='command', help='Command')
@@ -44,19 +148,48 @@ def main():
               'tapp-election-pids', 'tapp-transition-pids', 'tapp-pids',
               'whitehouse']:
         command_parsers[k].add_argument('args', nargs='*', help='arguments to command')
+    command_parsers['tapp-pids'].add_argument('--partition', choices=['year', 'month'], default='year',
+                                              help='date range to fetch pids for as a single (concurrent) job')
 
     opts = parser.parse_args()
+    if opts.resume and not opts.output:
+        parser.error('--resume requires --output')
 
     logging_level = verbosity_levels[opts.verbose]
     logging.basicConfig(level=logging_level)
     logger.setLevel(logging_level)
 
-    command = commands[opts.command]
-    for obj in command(opts):
-        json_string = json.dumps(obj, sort_keys=True, ensure_ascii=False)
-        sys.stdout.write(json_string)
-        sys.stdout.write('\n')
-        sys.stdout.flush()
+    scraping.throttle.max_concurrency = opts.max_per_host
+    scraping.throttle.delay = opts.delay
+    scraping.restricted_parsing = opts.restricted_parsing
+    # enough pooled connections that none of the concurrent jobs has to open a new one per request
+    scraping.transport.resize_pool(max(opts.jobs, 1))
+    cache = None
+    if opts.cache:
+        host_ttls = {host: float(seconds) for host, seconds in (arg.split('=') for arg in opts.cache_host_ttl)}
+        cache = scraping.configure_cache(opts.cache, opts.cache_ttl, host_ttls, opts.cache_max_bytes)
+
+    opts.done = set()
+    if opts.resume:
+        opts.done = _load_checkpoint(opts.output)
+        logger.info('Resuming with %d records already in %s', len(opts.done), opts.output)
+
+    def iter_new_records():
+        # commands that cannot skip their inputs may still produce records we already have
+        for obj in commands[opts.command](opts):
+            key = _record_key(obj)
+            if key not in opts.done:
+                opts.done.add(key)
+                yield obj
+
+    if opts.output:
+        with open(opts.output, 'a' if opts.resume else 'w', encoding='utf-8') as fp:
+            _write_batches(iter_new_records(), fp, opts.batch_size, sync=True)
+    else:
+        _write_batches(iter_new_records(), sys.stdout, opts.batch_size)
+
+    if cache is not None:
+        logger.info('HTTP cache: %r', cache)
 
 
 if __name__ == '__main__':
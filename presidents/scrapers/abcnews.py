@@ -15,14 +15,22 @@ def _iter_article_paragraphs(soup):
         yield paragraph.get_text().strip()
 
 
-def fetch(page_url):
+def source_url(page_url):
     '''
-    Given a full ABC News url, or just the partial path, fetch the page and
-    return a standard speech dict
+    Given a full ABC News url, or just the partial path, return the full url
     '''
     url = page_url
     if not url.startswith(base_url):
         url = f"{base_url}/{url.lstrip('/')}"
+    return url
+
+
+def fetch(page_url):
+    '''
+    Given a full ABC News url, or just the partial path, fetch the page and
+    return a standard speech dict
+    '''
+    url = source_url(page_url)
     soup = get_soup(url)
     timestamp_string = soup.find(class_='timestamp').get_text()
     return {
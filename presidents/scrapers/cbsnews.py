@@ -1,5 +1,5 @@
 from presidents.scraping import get_soup
-from presidents.util import parse_date, tzinfos
+from presidents.util import parse_date, load_tzinfos
 
 base_url = 'http://www.cbsnews.com'
 
@@ -13,18 +13,26 @@ def _iter_article_paragraphs(soup):
         yield paragraph.get_text().strip()
 
 
-def fetch(page_url):
+def source_url(page_url):
     '''
-    Given a full CBS News url, or just the partial path, fetch the page and
-    return a standard speech dict
+    Given a full CBS News url, or just the partial path, return the full url
     '''
     url = page_url
     if not url.startswith(base_url):
         url = base_url + '/' + url.lstrip('/')
+    return url
+
+
+def fetch(page_url):
+    '''
+    Given a full CBS News url, or just the partial path, fetch the page and
+    return a standard speech dict
+    '''
+    url = source_url(page_url)
     soup = get_soup(url)
     timestamp_string = soup.find(class_='byline').find(class_='time').get_text()
     return {
         'source': url,
-        'timestamp': parse_date(timestamp_string, tzinfos['EST']).isoformat(),
+        'timestamp': parse_date(timestamp_string, load_tzinfos()['EST']).isoformat(),
         'text': '\n'.join(_iter_article_paragraphs(soup)),
     }
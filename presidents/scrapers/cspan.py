@@ -29,13 +29,17 @@ def _fetch_transcript_paragraphs(program_id):
         yield ' '.join(text.strip().split())
 
 
+def source_url(program_id):
+    return 'https://www.c-span.org/video/?' + program_id
+
+
 def fetch(program_id):
     '''
     Scrape C-SPAN transcript from https://www.c-span.org/ by Program ID
 
     Returns a standard paper/article dict
     '''
-    url = 'https://www.c-span.org/video/?' + program_id
+    url = source_url(program_id)
     soup = get_soup(url)
     datalist = soup.find(id='more-information').find(class_='details').find('dl')
     details = {k.strip(':'): v for k, v in iter_datalist_pairs(datalist)}
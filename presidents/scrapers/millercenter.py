@@ -2,11 +2,9 @@ import logging
 import re
 from datetime import datetime
 
-from bs4 import BeautifulSoup
 from bs4.element import NavigableString
-import requests
 
-from presidents.scraping import get_soup
+from presidents.scraping import ElementStrainer, get_html, get_soup, map_concurrently, parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +21,13 @@ def _split_title(title):
     return title, None
 
 
+# the only elements _iter_speeches() and parse() read from their pages
+listing_elements = ElementStrainer(ids=['listing'])
+speech_elements = ElementStrainer(ids=['transcript'])
+
+
 def _iter_speeches():
-    soup = get_soup(base_url + '/president/speeches')
+    soup = get_soup(base_url + '/president/speeches', listing_elements)
     current_author = None
     for child in soup.find(id='listing').children:
         if child.name == 'h2':
@@ -51,31 +54,54 @@ def _iter_paragraphs(transcript):
                     yield subchild.get_text()
 
 
-def fetch_speeches():
-    for author, title, date, href in _iter_speeches():
-        speech_url = base_url + href
-        speech_html = requests.get(speech_url).text
-        # Lincoln's "Cooper Union Address" has some issues :(
-        speech_html = speech_html.replace(
-            '<div id="_mcePaste" style="position: absolute; left: -10000px; top: 120px; '
-            'width: 1px; height: 1px; overflow-x: hidden; overflow-y: hidden;">', '<p>')
-        soup = BeautifulSoup(speech_html)
-        # Herbert Hoover's "Campaign speech in Indianapolis, Indiana" has even worse issues :(
-        if author == 'Herbert Hoover' and title == 'Campaign speech in Indianapolis, Indiana.':
-            logger.info("Fixing Hoover's Indianapolis speech")
-            transcript_p = soup.find(id='description').next_sibling.extract()
-            soup.find(id='transcript').append(transcript_p)
-        transcript = soup.find(id='transcript')
-        # two of the speeches have missing transcripts :(
-        if transcript:
-            paragraphs = [paragraph.strip() for paragraph in _iter_paragraphs(transcript) if not paragraph.isspace()]
-            # replace &nbsp; + space with just the space
-            text = '\n'.join(paragraphs).replace('\xA0 ', ' ')
-            timestamp = date.date().isoformat() if date else None
-            yield {
-                'author': author,
-                'title': title,
-                'timestamp': timestamp,
-                'text': text,
-                'source': speech_url,
-            }
+def fetch_speech(author, title, date, href):
+    '''
+    Fetch a single speech, as listed by _iter_speeches(), returning a standard
+    speech dict, or None if its transcript is missing
+    '''
+    speech_url = base_url + href
+    return parse(get_html(speech_url), speech_url, author, title, date)
+
+
+def parse(speech_html, speech_url, author=None, title=None, date=None):
+    '''
+    Parse the HTML of a single speech's page at `speech_url`, as listed by
+    _iter_speeches(), into a standard speech dict, or None if its transcript is missing
+    '''
+    # Lincoln's "Cooper Union Address" has some issues :(
+    speech_html = speech_html.replace(
+        '<div id="_mcePaste" style="position: absolute; left: -10000px; top: 120px; '
+        'width: 1px; height: 1px; overflow-x: hidden; overflow-y: hidden;">', '<p>')
+    # Herbert Hoover's "Campaign speech in Indianapolis, Indiana" has even worse issues :(
+    if author == 'Herbert Hoover' and title == 'Campaign speech in Indianapolis, Indiana.':
+        logger.info("Fixing Hoover's Indianapolis speech")
+        # its transcript is outside #transcript, so parse the whole page
+        soup = parse_html(speech_html)
+        transcript_p = soup.find(id='description').next_sibling.extract()
+        soup.find(id='transcript').append(transcript_p)
+    else:
+        soup = parse_html(speech_html, speech_elements)
+    transcript = soup.find(id='transcript')
+    # two of the speeches have missing transcripts :(
+    if not transcript:
+        return None
+    paragraphs = [paragraph.strip() for paragraph in _iter_paragraphs(transcript) if not paragraph.isspace()]
+    # replace &nbsp; + space with just the space
+    text = '\n'.join(paragraphs).replace('\xA0 ', ' ')
+    timestamp = date.date().isoformat() if date else None
+    return {
+        'author': author,
+        'title': title,
+        'timestamp': timestamp,
+        'text': text,
+        'source': speech_url,
+    }
+
+
+def fetch_speeches(max_workers=1, ordered=True, skip_sources=frozenset()):
+    '''
+    Fetch all speeches, except those whose source url is in `skip_sources`
+    '''
+    listings = (listing for listing in _iter_speeches() if base_url + listing[-1] not in skip_sources)
+    speeches = map_concurrently(lambda listing: fetch_speech(*listing), listings, max_workers, ordered)
+    return filter(None, speeches)
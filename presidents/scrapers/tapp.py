@@ -5,10 +5,12 @@ from datetime import datetime
 
 from bs4 import BeautifulSoup
 from bs4.element import NavigableString
+from cytoolz import unique
 
 from presidents import DATA_DIR
+from presidents.ldjson import LineIndex, read_lazy_speeches
 from presidents.util import parse_date
-from presidents.scraping import get_soup, get_html, iter_lines
+from presidents.scraping import ElementStrainer, get_soup, get_html, iter_lines, map_concurrently, parse_html
 
 logger = logging.getLogger(__name__)
 
@@ -117,13 +119,28 @@ presidents = [
 ]
 
 
+def source_url(pid):
+    return base_url + '/ws/index.php?pid=' + pid
+
+
+# the only elements parse() reads from a paper's page
+paper_elements = ElementStrainer(names=['title'], classes=['docdate', 'displaytext', 'displaynotes'])
+
+
 def fetch(pid):
     '''
     Fetch single paper from The American Presidency Project website (http://www.presidency.ucsb.edu/)
     and return as standard paper/article dict
     '''
-    url = base_url + '/ws/index.php?pid=' + pid
-    soup = get_soup(url)
+    url = source_url(pid)
+    return parse(get_html(url), url)
+
+
+def parse(html, url):
+    '''
+    Parse the HTML of a single paper's page at `url` into a standard paper/article dict
+    '''
+    soup = parse_html(html, paper_elements)
     # the HTML they generate is awkward, to say the least
     author, title = soup.find('title').get_text().split(': ', 1)
     date_string = soup.find('span', class_='docdate').string
@@ -146,20 +163,37 @@ def fetch(pid):
     return paper
 
 
+local_cache_path = DATA_DIR / 'tapp' / 'all.local-cache.json'
+
+
+def _paper_pid(paper):
+    _, paper_pid = paper['source'].split('=', 1)
+    return paper_pid
+
+
+local_cache_index = LineIndex(local_cache_path, _paper_pid)
+
+
 def read_local_cache():
-    all_json_path = DATA_DIR / 'tapp' / 'all.local-cache.json'
-    with open(all_json_path) as fp:
+    with open(local_cache_path) as fp:
         for line in fp:
             yield json.loads(line)
 
 
+def read_local_cache_speeches():
+    '''
+    Read every paper in the local cache as a LazySpeech, decoding each one's text
+    only when it is accessed
+    '''
+    return read_lazy_speeches(local_cache_path)
+
+
 def read_from_local_cache(pids):
-    # pids should be a list of strings
-    pidset = set(pids)
-    for paper in read_local_cache():
-        _, paper_pid = paper['source'].split('=', 1)
-        if paper_pid in pidset:
-            yield paper
+    '''
+    Read the papers with the given pids (a list of strings) from the local cache,
+    via an index of pid -> byte offset that is rebuilt whenever the cache changes
+    '''
+    return local_cache_index.read(pids)
 
 
 def _get_pids(soup):
@@ -217,14 +251,17 @@ def fetch_election_pids(year):
                     yield pid
 
 
-def fetch_inaugurals():
+def fetch_inaugurals(max_workers=1):
+    '''
+    Fetch all inaugural addresses; since their titles depend on how many
+    inaugurals each author gave previously, they are always fetched in order
+    '''
     ordinals = ['Zeroth', 'First', 'Second', 'Third', 'Fourth']
     soup = get_soup(base_url + '/inaugurals.php')
     pids = _get_pids(soup)
     # TAPP doesn't title (number) each inaugural distinctly
     authors = dict()
-    for pid in pids:
-        paper = fetch(pid)
+    for paper in map_concurrently(fetch, pids, max_workers, ordered=True):
         author = paper['author']
         nth = authors[author] = authors.get(author, 0) + 1
         # TAPP does not use consistent titles; e.g.,
@@ -285,7 +322,63 @@ def read_president_papers(president):
     return read_from_local_cache(pids)
 
 
-def fetch_pids(params):
+def _fetch_pids_page(params):
+    '''
+    Fetch the first page of results for the query `params`, returning a tuple of
+    (the total number of records found, the pids on this page, the dates of the
+    first and last of them)
+    '''
+    soup = get_soup(base_url + '/ws/index.php', params=params)
+    pids = list(_get_pids(soup))
+    listdates = soup.select('.listdate')
+    if not listdates:
+        return _get_records_found(soup), pids, None, None
+    first_date, last_date = (parse_date(listdate.get_text()) for listdate in (listdates[0], listdates[-1]))
+    return _get_records_found(soup), pids, first_date, last_date
+
+
+def _date_range_params(params, year, month=None, daystart=1):
+    '''
+    Restrict the query `params` to a single year, or a single month of that year
+    (from `daystart` to the end of the month).
+    '''
+    return dict(params,
+                yearstart=str(year), yearend=str(year),
+                monthstart=f'{month or 1:02d}', monthend=f'{month or 12:02d}',
+                daystart=f'{daystart:02d}', dayend='31')
+
+
+def _fetch_partition_pids(params, year, month=None):
+    '''
+    Fetch all pids for the query `params` within a single year, or a single month.
+
+    The TAPP website considers years and month/day separately when searching by
+    year, so a partition whose results do not fit on one page is split into months,
+    and then paged through by continuing from the day of the last pid seen.
+    '''
+    records_found, pids, _, last_date = _fetch_pids_page(_date_range_params(params, year, month))
+    if len(pids) >= records_found:
+        return pids
+    if month is None:
+        logger.debug('splitting %d into months (%d records found)', year, records_found)
+        return [pid for month in range(1, 13) for pid in _fetch_partition_pids(params, year, month)]
+    seen = set(pids)
+    while True:
+        # some pids on the last date may be on the next page, so continue from that date
+        logger.debug('continuing %d-%02d from day %d', year, month, last_date.day)
+        page_params = _date_range_params(params, year, month, last_date.day)
+        page_records_found, page_pids, _, last_date = _fetch_pids_page(page_params)
+        new_pids = [pid for pid in unique(page_pids) if pid not in seen]
+        seen.update(new_pids)
+        pids.extend(new_pids)
+        if len(page_pids) >= page_records_found or not new_pids:
+            break
+    if len(pids) < records_found:
+        logger.warning('found only %d of %d pids for %d-%02d', len(pids), records_found, year, month)
+    return pids
+
+
+def fetch_pids(params, partition='year', max_workers=1):
     '''
     Fetch all paper IDs for a combination of query params, which can be any of:
     * ty (Document Category, i.e., "type")
@@ -294,36 +387,43 @@ def fetch_pids(params):
     * daynum (day of the month)
     * year (Year, 4 digits; any of the 229 years from 1789 to 2017)
 
-    args is a list of strings in the form "key=value"
+    The query is split into independent date ranges, one per year (partition='year')
+    or per month (partition='month'), from the date of the earliest result through
+    the last year the query allows (its year or yearend, or else the current year),
+    which are fetched `max_workers` at a time, unless the first page has all results.
+    Yields each distinct pid once, in order of partition completion.
     '''
     params = dict(params, includepress='1', includecampaign='1')
 
-    soup = get_soup(base_url + '/ws/index.php', params=params)
-    records_found = _get_records_found(soup)
-    logger.debug('fetching %d total pids', records_found)
-
-    page_pids = list(_get_pids(soup))
-    logger.debug('found %d pids on current page', len(page_pids))
-    for pid in page_pids:
-        yield pid
-    if len(page_pids) < records_found:
-        last_date = parse_date(soup.select('.listdate')[-1].get_text())
-        logger.debug('continuing from last_date: %s', last_date)
-
-        # The TAPP website considers years and month/day separately when searching by year.
-        # Or something. Can't quite figure it out. It's weird.
-
-        # get pids to end of year
-        params1 = dict(params,
-                       yearstart=last_date.year, yearend=last_date.year,
-                       monthstart=last_date.month, monthend='12',
-                       daystart=last_date.day, dayend='31')
-        for pid in fetch_pids(params1):
-            yield pid
-        # then start at the next year
-        params2 = dict(params,
-                       yearstart=last_date.year + 1, yearend='2020',
-                       monthstart='01', monthend='12',
-                       daystart='01', dayend='31')
-        for pid in fetch_pids(params2):
-            yield pid
+    # results are listed in chronological order, so the first page gives the earliest date
+    records_found, first_pids, first_date, _ = _fetch_pids_page(params)
+    logger.info('fetching %d total pids', records_found)
+    if len(first_pids) >= records_found:
+        yield from unique(first_pids)
+        return
+    if first_date is None:
+        return
+    # partitions set their own yearstart and yearend, which replace a single year
+    last_year = int(params.pop('year', params.get('yearend', datetime.now().year)))
+    years = range(first_date.year, min(last_year, datetime.now().year) + 1)
+    if partition == 'year':
+        partitions = [(year, None) for year in years]
+    elif partition == 'month':
+        partitions = [(year, month) for year in years for month in range(1, 13)]
+    else:
+        raise ValueError(f'Unrecognized partition: {partition}')
+
+    seen = set()
+    partitions_pids = map_concurrently(lambda year_month: _fetch_partition_pids(params, *year_month),
+                                       partitions, max_workers, ordered=False)
+    for i, pids in enumerate(partitions_pids, 1):
+        for pid in pids:
+            if pid not in seen:
+                seen.add(pid)
+                yield pid
+        logger.info('fetched %d of %d pids (%d of %d partitions)', len(seen), records_found, i, len(partitions))
+        if len(seen) >= records_found:
+            # any remaining partitions cannot contain more
+            break
+    if len(seen) < records_found:
+        logger.warning('found only %d of %d pids', len(seen), records_found)
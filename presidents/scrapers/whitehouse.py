@@ -2,7 +2,7 @@ from urllib.parse import urljoin
 import logging
 import requests
 
-from presidents.scraping import get_soup, iter_lines
+from presidents.scraping import ElementStrainer, get_html, get_soup, iter_lines, map_concurrently, parse_html
 from presidents.util import parse_date
 
 logger = logging.getLogger(__name__)
@@ -10,8 +10,20 @@ logger = logging.getLogger(__name__)
 base_url = 'https://www.whitehouse.gov'
 
 
+# the only elements parse() reads from a page
+page_elements = ElementStrainer(ids=['content-start'], classes=['press-article-date'])
+
+
 def _fetch_page(url):
-    soup = get_soup(url)
+    return parse(get_html(url), url)
+
+
+def parse(html, url):
+    '''
+    Parse the HTML of a single briefing room page at `url` into a (partial)
+    standard speech dict
+    '''
+    soup = parse_html(html, page_elements)
     # heading_title = soup.select_one('.heading-title')
     # heading_subtitle = soup.select_one('.heading-subtitle')
     press_article_date = soup.select_one('.press-article-date')
@@ -61,19 +73,27 @@ def _iter_documents(soup):
         yield paragraph.get_text().strip()
 
 
-def _fetch_group(briefing_room_group):
+def _fetch_group(briefing_room_group, max_workers=1, ordered=True, skip_sources=frozenset()):
     '''
     Page through the listing for the specified briefing_room_group, and fetch
-    all its pages
+    all its pages, except those whose url is in `skip_sources`
     '''
     logger.info('Fetching briefing-room group: %s', briefing_room_group)
     url = base_url + '/briefing-room/' + briefing_room_group.lstrip('/')
-    for title, page_url in _iter_group_pages(url):
+
+    def fetch_group_page(title_page_url):
+        title, page_url = title_page_url
         try:
             page = _fetch_page(page_url)
-            yield dict(title=title, **page)
+            return dict(title=title, **page)
         except requests.exceptions.TooManyRedirects as exc:
             logger.warning('Failed to fetch "%s": %s', page_url, exc)
+            return None
+
+    group_pages = (title_page_url for title_page_url in _iter_group_pages(url)
+                   if title_page_url[1] not in skip_sources)
+    pages = map_concurrently(fetch_group_page, group_pages, max_workers, ordered)
+    return filter(None, pages)
 
 
 briefing_room_groups = [
@@ -101,9 +121,9 @@ briefing_room_groups = [
 ]
 
 
-def fetch_all(selected_briefing_room_groups=None):
+def fetch_all(selected_briefing_room_groups=None, max_workers=1, ordered=True, skip_sources=frozenset()):
     if not selected_briefing_room_groups:
         selected_briefing_room_groups = briefing_room_groups
     for briefing_room_group in selected_briefing_room_groups:
-        for page in _fetch_group(briefing_room_group):
+        for page in _fetch_group(briefing_room_group, max_workers, ordered, skip_sources):
             yield page
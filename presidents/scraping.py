@@ -1,60 +1,84 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, TypeVar
+from urllib.parse import urlparse
 import logging
 import os
 import re
+import threading
+import time
 import warnings
 
-from bs4 import BeautifulSoup
-from bs4.element import NavigableString
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import requests
-import requests_cache
+
+from presidents.httpcache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
-requests_cache_filepath = os.getenv('PYTHON_REQUESTS_CACHE', '/tmp/python-requests_cache')
-requests_cache.install_cache(requests_cache_filepath)
-logger.debug('using HTTP requests cache at %s', requests_cache_filepath)
+# default location for configure_cache()
+http_cache_filepath = os.getenv('PRESIDENTS_HTTP_CACHE', '/tmp/presidents-http_cache.sqlite')
 
 # suppress BeautifulSoup warning; I want to use the best available parser, but I don't care which
 warnings.filterwarnings('ignore', category=UserWarning, module='bs4')
 
+# when enabled, parse_html builds only the elements that the scraper says it needs;
+# off until benchmarks/scraper_parsing.py has confirmed identical output on saved real pages
+restricted_parsing = False
+
 
 def iter_texts(element):
     '''
-    Recurse into a single BeautifulSoup element, generically extracting legible
+    Walk a single BeautifulSoup element, generically extracting legible
     text as unicode strings
     '''
+    # a stack of the elements and strings still to process, in reverse order;
     # we want to collect contiguous spans of strings or non-block elements as a single paragraph
-    if isinstance(element, NavigableString):
-        yield str(element)
-    elif element.name == 'li':
-        yield '\n'
-        yield '* '
-        for child in element.children:
-            for text in iter_texts(child):
-                yield text
-        yield '\n'
-    elif element.name in {'br', 'hr'}:
-        yield '\n'
-    elif element.name in {'p', 'div', 'ol', 'ul'}:
-        yield '\n'
-        for child in element.children:
-            for text in iter_texts(child):
-                yield text
-        yield '\n'
-    else:
-        for child in element.children:
-            for text in iter_texts(child):
-                yield text
+    stack = [element]
+    while stack:
+        item = stack.pop()
+        # NavigableStrings as well as the line breaks pushed below
+        if isinstance(item, str):
+            yield str(item)
+        elif item.name == 'li':
+            yield '\n'
+            yield '* '
+            stack.append('\n')
+            stack.extend(reversed(item.contents))
+        elif item.name in {'br', 'hr'}:
+            yield '\n'
+        elif item.name in {'p', 'div', 'ol', 'ul'}:
+            yield '\n'
+            stack.append('\n')
+            stack.extend(reversed(item.contents))
+        else:
+            stack.extend(reversed(item.contents))
 
 
 def iter_lines(*elements):
     '''
     Iterate over all texts in elements using iter_texts(element), merging
     contiguous line breaks, yielding individual lines as unicode strings
+    as the line breaks are reached
     '''
-    texts = (text for element in elements for text in iter_texts(element))
-    lines = ''.join(texts).split('\n')
-    for line in lines:
+    # the texts since the last line break that we split on; splitting only once
+    # there are a few dozen of them is much faster than splitting on each one
+    pieces = []
+    for element in elements:
+        for text in iter_texts(element):
+            pieces.append(text)
+            if len(pieces) >= 64 and '\n' in text:
+                *lines, last = ''.join(pieces).split('\n')
+                for line in lines:
+                    stripped_line = line.strip()
+                    if len(stripped_line) != 0:
+                        yield stripped_line
+                pieces = [last]
+    for line in ''.join(pieces).split('\n'):
         stripped_line = line.strip()
         if len(stripped_line) != 0:
             yield stripped_line
@@ -90,11 +114,208 @@ def reencode_response(response):
     return response
 
 
+class HostThrottle:
+    '''
+    Limit the requests made to each host to at most `max_concurrency` at a time,
+    starting at least `delay` seconds apart.
+    '''
+    def __init__(self, max_concurrency: int = 4, delay: float = 0.0):
+        self.max_concurrency = max_concurrency
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start_times = {}
+
+    @contextmanager
+    def __call__(self, url: str):
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrency)
+        with semaphore:
+            # reserve the next start time for this host, then wait for it outside the lock
+            with self._lock:
+                now = time.monotonic()
+                start_time = max(now, self._next_start_times.get(host, now))
+                self._next_start_times[host] = start_time + self.delay
+            if start_time > now:
+                time.sleep(start_time - now)
+            yield
+
+
+throttle = HostThrottle()
+
+
+class Transport:
+    '''
+    HTTP transport shared by all scrapers: a single requests.Session, with
+    * keep-alive connection pooling (up to `pool_maxsize` connections per host),
+    * up to `retries` retries, with exponential backoff (`backoff_factor` * 2^n seconds),
+      on connection errors, read timeouts (after `timeout` seconds), and 5xx responses,
+    * an optional ResponseCache, `cache`: fresh cached responses are returned
+      without any request, while stale ones are revalidated with conditional
+      requests (If-None-Match / If-Modified-Since, from their ETag / Last-Modified),
+      so that a 304 Not Modified reuses the cached text.
+
+    Requests that do go over the network are subject to the per-host `throttle`.
+    '''
+    def __init__(self, pool_maxsize: int = 16, retries: int = 5, backoff_factor: float = 0.5,
+                 timeout: float = 30.0, cache: Optional[ResponseCache] = None):
+        self.timeout = timeout
+        self.cache = cache
+        self.retry = Retry(total=retries, backoff_factor=backoff_factor,
+                           status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+        self.session = requests.Session()
+        self.resize_pool(pool_maxsize)
+
+    def resize_pool(self, pool_maxsize: int):
+        '''
+        Keep up to `pool_maxsize` connections alive per host, e.g., one for each
+        thread that map_concurrently may be fetching with.
+        '''
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=self.retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get_text(self, url: str, params=None, **kwargs) -> str:
+        '''
+        GET `url` (with query `params`) and return the response's text,
+        re-encoded according to reencode_response.
+        '''
+        request_url = requests.Request('GET', url, params=params).prepare().url
+        cached = self.cache.get(request_url) if self.cache is not None else None
+        if cached and self.cache.is_fresh(request_url, cached):
+            logger.debug('Using cached response for "%s"', request_url)
+            return cached.text
+        headers = dict(kwargs.pop('headers', None) or {})
+        if cached:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+        kwargs.setdefault('timeout', self.timeout)
+        logger.info('Fetching "%s"', request_url)
+        with throttle(request_url):
+            response = self.session.get(request_url, headers=headers, **kwargs)
+        if response.status_code == 304 and cached:
+            logger.debug('Not modified: "%s"', request_url)
+            self.cache.revalidated(request_url)
+            return cached.text
+        response.raise_for_status()
+        text = reencode_response(response).text
+        if self.cache is not None:
+            self.cache.put(request_url, text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return text
+
+
+transport = Transport()
+
+
+def configure_cache(path: str = http_cache_filepath,
+                    default_ttl: Optional[float] = None,
+                    host_ttls: Optional[Dict[str, Optional[float]]] = None,
+                    max_bytes: Optional[int] = None) -> ResponseCache:
+    '''
+    Cache responses fetched via get_html / get_soup in a ResponseCache at `path`
+    (see ResponseCache for the other options). Nothing is cached until this is called.
+    '''
+    transport.cache = ResponseCache(path, default_ttl, host_ttls, max_bytes)
+    logger.debug('Using HTTP response cache at %s', path)
+    return transport.cache
+
+
 def get_html(url, **kwargs):
-    logger.info('Fetching "%s" %r', url, kwargs)
-    response = reencode_response(requests.get(url, **kwargs))
-    return response.text
+    return transport.get_text(url, **kwargs)
+
+
+class ElementStrainer(SoupStrainer):
+    '''
+    SoupStrainer that keeps every element (along with all of its descendants)
+    whose tag name is in `names`, whose id is in `ids`, or which has any of `classes`.
+    '''
+    def __init__(self, names: Iterable[str] = (), ids: Iterable[str] = (), classes: Iterable[str] = ()):
+        super().__init__()
+        self.names = frozenset(names)
+        self.ids = frozenset(ids)
+        self.classes = frozenset(classes)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} names={set(self.names)} ids={set(self.ids)} classes={set(self.classes)}>"
+
+    def matches(self, name: str, attrs: Dict[str, str]) -> bool:
+        # attrs are as given by the parser, so class is still a single string
+        return (name in self.names or attrs.get('id') in self.ids or
+                not self.classes.isdisjoint(attrs.get('class', '').split()))
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # when searching an already-built tree, behave like an empty SoupStrainer
+        if isinstance(markup_name, Tag):
+            return super().search_tag(markup_name, markup_attrs)
+        return self.matches(markup_name, markup_attrs)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        # newer versions of BeautifulSoup ask this instead of search_tag
+        return self.matches(name, attrs or {})
+
+
+def parse_html(html, parse_only: Optional[SoupStrainer] = None):
+    '''
+    Parse `html` with the best available parser, or, if `parse_only` is given (and
+    `restricted_parsing` is enabled), with lxml, building only the matching elements.
+    '''
+    if parse_only is not None and restricted_parsing:
+        return BeautifulSoup(html, 'lxml', parse_only=parse_only)
+    return BeautifulSoup(html)
+
+
+def get_soup(url, parse_only: Optional[SoupStrainer] = None, **kwargs):
+    return parse_html(get_html(url, **kwargs), parse_only)
+
+
+X = TypeVar("X")
+Y = TypeVar("Y")
+
+
+def map_concurrently(func: Callable[[X], Y], items: Iterable[X],
+                     max_workers: int = 1, ordered: bool = True) -> Iterator[Y]:
+    '''
+    Apply `func` to each of `items` on a pool of `max_workers` threads, yielding
+    results in input order if `ordered`, otherwise as soon as each one completes.
+
+    Items are consumed lazily, with only about `max_workers` calls in flight at a time;
+    if the caller stops iterating early, the calls that have not started yet are cancelled.
+
+    Requests made via get_html / get_soup are still subject to the per-host `throttle`.
+    '''
+    if max_workers == 1:
+        yield from map(func, items)
+        return
+    items = iter(items)
+    # submitted but not yet yielded, in input order (only the order matters when `ordered`)
+    pending = deque()
 
+    def submit_next(executor) -> bool:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            return True
+        return False
 
-def get_soup(url, **kwargs):
-    return BeautifulSoup(get_html(url, **kwargs))
+    with ThreadPoolExecutor(max_workers) as executor:
+        try:
+            # keep each worker busy, plus one more ready to go as soon as one finishes
+            while len(pending) <= max_workers and submit_next(executor):
+                pass
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                    pending.remove(future)
+                submit_next(executor)
+                yield future.result()
+        finally:
+            # don't let the executor's shutdown wait for calls nobody will consume
+            # (like shutdown(cancel_futures=True), which needs Python 3.9)
+            for future in pending:
+                future.cancel()
@@ -1,13 +1,24 @@
 from collections import Counter
-from functools import lru_cache, reduce
-from typing import Callable, Dict, Iterable, Iterator, List, Tuple, TypeVar
+from functools import lru_cache, partial
+from multiprocessing import Pool
+from typing import (Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, Match, Optional, Pattern, Set,
+                    Tuple, TypeVar, Union)
+import heapq
 import itertools
 import logging
-import operator
+import re
 
-from spacy.tokens import Doc, Token
+try:
+    # the parser behind re.compile, to find the literal prefixes of regular expressions
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+from scipy import sparse
+from spacy.tokens import Doc, Span, Token
 from spacy.lexeme import Lexeme
 import cytoolz as toolz
+import numpy as np
 import spacy
 
 from presidents.stopwords import contraction_suffixes
@@ -15,12 +26,16 @@ from presidents.stopwords import contraction_suffixes
 logger = logging.getLogger(__name__)
 
 
+# missing stop words (contractions whose lemmas are stopwords, mostly)
+extra_stop_words = contraction_suffixes | {'going', 'getting', 'got'} | {'-PRON-'}
+
+
 @lru_cache()
 def load_nlp():
     nlp = spacy.load('en_core_web_md', disable=['parser', 'ner'])
     nlp.max_length = 10_000_000
-    # add missing stop words (contractions whose lemmas are stopwords, mostly)
-    for stopword_string in contraction_suffixes | {'going', 'getting', 'got'} | {'-PRON-'}:
+    # add missing stop words
+    for stopword_string in extra_stop_words:
         nlp.vocab[stopword_string].is_stop = True
     logger.info("Loaded %(lang)s-%(name)s with pipeline=%(pipeline)s (v%(version)s)", nlp.meta)
     return nlp
@@ -52,6 +67,10 @@ def _is_word(lexeme: Lexeme) -> bool:
     return not (lexeme.is_stop or lexeme.is_punct or lexeme.is_space)
 
 
+def _orth(token: Token) -> int:
+    return token.orth
+
+
 def count_words_by(doc: Doc, attr_id: int = spacy.attrs.ORTH) -> Dict[str, int]:
     """
     Get a dict mapping tokens to counts for the given spaCy document, `doc`.
@@ -95,7 +114,7 @@ def collocations(
 
 def sentence_collocations(docs: Iterable[Doc],
                           test_token=_is_word,
-                          map_token=lambda token: token.orth):
+                          map_token=_orth):
     '''
     test_token: predicate that takes a Lexeme and returns True or False to
                 determine whether to include it or not
@@ -117,78 +136,528 @@ def sentence_collocations(docs: Iterable[Doc],
 sentence_collocation_counts = toolz.compose(Counter, sentence_collocations)
 
 
+def _resize_square(matrix: sparse.csr_matrix, n: int) -> sparse.csr_matrix:
+    '''
+    Pad the square CSR `matrix` with empty rows and columns up to (n x n).
+    '''
+    n_rows = matrix.shape[0]
+    indptr = np.concatenate((matrix.indptr, np.full(n - n_rows, matrix.indptr[-1])))
+    return sparse.csr_matrix((matrix.data, matrix.indices, indptr), shape=(n, n))
+
+
+class CooccurrenceMatrix:
+    '''
+    Streaming accumulator of sentence-level co-occurrence counts.
+
+    Each distinct value (e.g., a lexeme id) is mapped to a compact integer index,
+    in order of first appearance. Sentences are buffered as sparse (sentence x value)
+    count vectors, and every `batch_size` sentences the buffer S is folded into the
+    symmetric (value x value) matrix as S.T @ S, minus its diagonal; so the count for
+    a pair of distinct values is the sum, over sentences, of the product of their
+    counts in that sentence, exactly as with sentence_collocations, but without ever
+    materializing the pairs. Memory is bounded by the number of distinct co-occurring
+    pairs (at most the vocabulary size squared) plus one batch of sentences.
+    '''
+    def __init__(self, batch_size: int = 10_000):
+        self.batch_size = batch_size
+        self.values = []
+        self.index = {}
+        self._matrix = sparse.csr_matrix((0, 0), dtype=np.int64)
+        self._indices = []
+        self._indptr = [0]
+        self._masks = {}
+
+    @classmethod
+    def from_mapping(cls, collocation_mapping: Mapping[Hashable, Counter]):
+        '''
+        Build from a mapping of value -> Counter(mapping of value -> count),
+        like sentence_collocation_mapping produces.
+        '''
+        cooccurrences = cls()
+        index = cooccurrences.index
+        rows = []
+        columns = []
+        data = []
+        for value1, counter in collocation_mapping.items():
+            for value2, count in counter.items():
+                for value in (value1, value2):
+                    if value not in index:
+                        index[value] = len(cooccurrences.values)
+                        cooccurrences.values.append(value)
+                rows.append(index[value1])
+                columns.append(index[value2])
+                data.append(count)
+        n_values = len(cooccurrences.values)
+        cooccurrences._matrix = sparse.csr_matrix((np.array(data, dtype=np.int64), (rows, columns)),
+                                                  shape=(n_values, n_values))
+        return cooccurrences
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {len(self)} values ({self.matrix.nnz} nonzero)>"
+
+    def add_sentence(self, values: Iterable[Hashable]):
+        index = self.index
+        for value in values:
+            i = index.get(value)
+            if i is None:
+                i = index[value] = len(self.values)
+                self.values.append(value)
+            self._indices.append(i)
+        self._indptr.append(len(self._indices))
+        if len(self._indptr) > self.batch_size:
+            self.flush()
+
+    def add_docs(self, docs: Iterable[Doc], test_token=_is_word, map_token=_orth):
+        '''
+        Add each sentence of each doc in `docs`, as a sentence of map_token(token) values
+        for each token such that test_token(token), like sentence_collocations.
+        '''
+        for doc in docs:
+            for sent in doc.sents:
+                self.add_sentence(map_token(token) for token in sent if test_token(token))
+
+    def flush(self):
+        '''
+        Fold the buffered sentences into the matrix.
+        '''
+        n_values = len(self.values)
+        n_sentences = len(self._indptr) - 1
+        matrix = self._matrix
+        if matrix.shape[0] < n_values:
+            matrix = _resize_square(matrix, n_values)
+        if n_sentences:
+            data = np.ones(len(self._indices), dtype=np.int64)
+            sentences = sparse.csr_matrix((data, self._indices, self._indptr), shape=(n_sentences, n_values))
+            sentences.sum_duplicates()
+            batch = (sentences.T @ sentences).tocoo()
+            # drop the diagonal (pairs of a value with itself)
+            off_diagonal = batch.row != batch.col
+            matrix = matrix + sparse.csr_matrix(
+                (batch.data[off_diagonal], (batch.row[off_diagonal], batch.col[off_diagonal])),
+                shape=(n_values, n_values))
+        self._matrix = matrix
+        self._indices = []
+        self._indptr = [0]
+
+    @property
+    def matrix(self) -> sparse.csr_matrix:
+        '''
+        The symmetric (value x value) CSR matrix of co-occurrence counts,
+        with rows and columns ordered like `values`.
+        '''
+        self.flush()
+        return self._matrix
+
+    def update(self, other: 'CooccurrenceMatrix'):
+        '''
+        Add the counts from another accumulator (e.g., one built in another process),
+        remapping its values into this one's index space.
+        '''
+        self.flush()
+        for value in other.values:
+            if value not in self.index:
+                self.index[value] = len(self.values)
+                self.values.append(value)
+        remapping = np.array([self.index[value] for value in other.values], dtype=np.int64)
+        other_matrix = other.matrix.tocoo()
+        n_values = len(self.values)
+        remapped = sparse.csr_matrix(
+            (other_matrix.data, (remapping[other_matrix.row], remapping[other_matrix.col])),
+            shape=(n_values, n_values))
+        self._matrix = _resize_square(self._matrix, n_values) + remapped
+
+    def collocates(self, value: Hashable) -> Counter:
+        '''
+        Return a Counter of the values co-occurring with `value`.
+        '''
+        i = self.index.get(value)
+        if i is None:
+            return Counter()
+        row = self.matrix.getrow(i)
+        return Counter({self.values[j]: count for j, count in zip(row.indices.tolist(), row.data.tolist())})
+
+    def _mask(self, exclude: Callable[[Hashable], bool]) -> np.ndarray:
+        '''
+        Return a boolean array over `values`, true where exclude(value),
+        memoized per `exclude` function and extended as values are added.
+        '''
+        mask = self._masks.get(exclude, np.zeros(0, dtype=bool))
+        if len(mask) < len(self.values):
+            new_values = self.values[len(mask):]
+            mask = np.concatenate((mask, np.fromiter(map(exclude, new_values), dtype=bool, count=len(new_values))))
+            self._masks[exclude] = mask
+        return mask
+
+    def top_collocates(self, values: Iterable[Hashable], n: int,
+                       exclude: Optional[Callable[[Hashable], bool]] = None) -> List[Hashable]:
+        '''
+        Return the `n` values that co-occur most with all of `values` combined,
+        in descending order of total count, omitting any for which exclude(value).
+
+        Sums the rows for `values` and selects the top n with argpartition, so
+        repeated queries cost O(vocabulary) each, rather than merging Counters.
+        '''
+        matrix = self.matrix
+        rows = [self.index[value] for value in values if value in self.index]
+        totals = np.asarray(matrix[rows].sum(axis=0)).ravel()
+        if exclude is not None:
+            totals[self._mask(exclude)] = 0
+        candidates = np.flatnonzero(totals > 0)
+        if len(candidates) > n:
+            candidates = candidates[np.argpartition(-totals[candidates], n)[:n]]
+        ordered = candidates[np.argsort(-totals[candidates], kind='stable')]
+        return [self.values[i] for i in ordered.tolist()]
+
+    def iter_mapping(self) -> Iterator[Tuple[Hashable, Counter]]:
+        '''
+        Iterate over (value, collocates Counter) pairs, in sorted order of value,
+        for every value with at least one collocate.
+        '''
+        matrix = self.matrix
+        for value in sorted(self.index):
+            i = self.index[value]
+            start, end = matrix.indptr[i], matrix.indptr[i + 1]
+            if start < end:
+                columns = matrix.indices[start:end].tolist()
+                counts = matrix.data[start:end].tolist()
+                yield value, Counter({self.values[j]: count for j, count in zip(columns, counts)})
+
+
 def sentence_collocation_mapping(docs: Iterable[Doc],
                                  test_token=_is_word,
-                                 map_token=lambda token: token.orth):
+                                 map_token=_orth):
     '''
     iterates over pairs: value1 -> mapping of (value2 -> count)
     '''
-    first = operator.itemgetter(0)
-    second = operator.itemgetter(1)
-    pairs = sentence_collocations(docs, test_token, map_token)
-    for value1, pairs in itertools.groupby(sorted(pairs, key=first), first):
-        yield value1, Counter(map(second, pairs))
+    cooccurrences = CooccurrenceMatrix()
+    cooccurrences.add_docs(docs, test_token, map_token)
+    return cooccurrences.iter_mapping()
+
 
+def _texts_cooccurrence_matrix(texts: List[str], test_token, map_token) -> CooccurrenceMatrix:
+    # imported here since presidents.docstore depends on this module
+    from presidents.docstore import parse
+    cooccurrences = CooccurrenceMatrix()
+    cooccurrences.add_docs(map(parse, texts), test_token, map_token)
+    cooccurrences.flush()
+    return cooccurrences
 
-def bootstrap_lexemes(lexemes: Iterable[int], collocation_mapping: Dict[int, Counter], n: int) -> int:
+
+def sentence_cooccurrence_matrix(texts: Iterable[str],
+                                 test_token=_is_word,
+                                 map_token=_orth,
+                                 n_process: int = 1,
+                                 chunk_size: int = 100) -> CooccurrenceMatrix:
+    '''
+    Accumulate sentence co-occurrences over the (cached) parses of `texts`,
+    across `n_process` processes, each handling `chunk_size` texts at a time,
+    merging their partial matrices as they finish.
+
+    With n_process > 1, test_token and map_token must be picklable (e.g., module-level functions).
+    '''
+    chunks = toolz.partition_all(chunk_size, texts)
+    accumulate = partial(_texts_cooccurrence_matrix, test_token=test_token, map_token=map_token)
+    cooccurrences = CooccurrenceMatrix()
+    if n_process == 1:
+        for chunk in chunks:
+            cooccurrences.update(accumulate(list(chunk)))
+    else:
+        with Pool(n_process) as pool:
+            for partial_cooccurrences in pool.imap_unordered(accumulate, map(list, chunks)):
+                cooccurrences.update(partial_cooccurrences)
+    return cooccurrences
+
+
+def _is_stop_lexeme(lexeme: int) -> bool:
+    return load_nlp().vocab[lexeme].is_stop
+
+
+def bootstrap_lexemes(lexemes: Iterable[int],
+                      collocation_mapping: Union[CooccurrenceMatrix, Mapping[int, Counter]],
+                      n: int,
+                      exclude_stop_words: bool = False) -> Iterator[int]:
     '''
     lexemes: integer ids
-    collocation_mapping: dict/mapping of lexeme -> Counter(mapping of lexeme -> count)
+    collocation_mapping: CooccurrenceMatrix, or dict/mapping of lexeme -> Counter(mapping of lexeme -> count)
+                         (of which only the Counters of `lexemes` are summed; to query one mapping
+                         many times, convert it once with CooccurrenceMatrix.from_mapping)
+    exclude_stop_words: if True, skip lexemes that are stop words
     '''
-    counters = [collocation_mapping.get(lexeme, Counter()) for lexeme in lexemes]
-    total_counter = reduce(operator.add, counters)
-    for lexeme, _ in total_counter.most_common(n):
+    exclude = _is_stop_lexeme if exclude_stop_words else None
+    if isinstance(collocation_mapping, CooccurrenceMatrix):
+        yield from collocation_mapping.top_collocates(lexemes, n, exclude)
+        return
+    total_counter = Counter()
+    for lexeme in lexemes:
+        total_counter.update(collocation_mapping.get(lexeme, ()))
+    if exclude is None:
+        ranked = total_counter.most_common(n)
+    else:
+        ranked = itertools.islice(((lexeme, count) for lexeme, count in total_counter.most_common()
+                                   if not exclude(lexeme)), n)
+    for lexeme, _ in ranked:
         yield lexeme
 
 
-def bootstrap_strings(strings: List[str], collocation_mapping: Dict[int, Counter], n: int,
-                      map_token=lambda token: token.orth):
+def bootstrap_strings(strings: List[str],
+                      collocation_mapping: Union[CooccurrenceMatrix, Mapping[int, Counter]],
+                      n: int,
+                      map_token=_orth,
+                      exclude_stop_words: bool = False):
     '''
     tokens: list of strings to parse (usually, a list of a synset's tokens)
-    collocation_mapping: dict/mapping of token -> Counter(mapping of token -> count)
+    collocation_mapping: CooccurrenceMatrix, or dict/mapping of token -> Counter(mapping of token -> count)
     '''
     nlp = load_nlp()
     lexemes = {map_token(token) for token in nlp(' '.join(strings))}
     for lexeme in lexemes:
         yield nlp.vocab[lexeme].orth_
-    collocated_lexemes = set(bootstrap_lexemes(lexemes, collocation_mapping, n))
+    collocated_lexemes = set(bootstrap_lexemes(lexemes, collocation_mapping, n, exclude_stop_words))
     for lexeme in collocated_lexemes - lexemes:
         yield nlp.vocab[lexeme].orth_
 
 
-def context_spans(haystack_doc: Doc, needle_re, preceding_window: int, subsequent_window: int):
+def token_offsets(doc: Doc) -> np.ndarray:
     '''
-    Return tuples for each (potentially overlapping) match of needle_re within haystack_doc,
-    of the form (preceding_span, match_span, subsequent_span), where each *_span is a spaCy Span instance.
+    Return the (sorted) character offset of each token in `doc`, i.e., each token.idx,
+    computed once per doc and kept in doc.user_data.
+    '''
+    offsets = doc.user_data.get('token_offsets')
+    if offsets is None or len(offsets) != len(doc):
+        offsets = doc.user_data['token_offsets'] = doc.to_array(spacy.attrs.IDX)
+    return offsets
 
-    TODO: use doc.char_span(start, end, label=0, vector=None), introduced in spaCy v2.0.0a10
-    See https://github.com/explosion/spaCy/issues/1264 and https://github.com/explosion/spaCy/issues/1050
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
     '''
-    nlp = load_nlp()
-    # haystack_idx_to_i maps each token's character index within the entire document to its index
-    haystack_idx_to_i = {token.idx: token.i for token in haystack_doc}
-    # logger.info('Finished mapping {} haystack token offsets to indices'.format(len(haystack_idx_to_i)))
-    for match in needle_re.finditer(haystack_doc.text):
-        # start, end = m.span()
-        start = match.start()
+    Return the number of tokens load_nlp()'s tokenizer splits `text` into (memoized).
+    '''
+    return len(load_nlp().tokenizer(text))
+
+
+# bound on the number of literal prefixes collected for any one MultiPattern pattern
+_max_literal_prefixes = 256
+
+
+def _sequence_prefixes(items) -> Tuple[Set[str], bool]:
+    '''
+    Return a set of literal strings that every match of the parsed regular expression
+    `items` starts with, and whether each of those is in fact the whole match.
+    '''
+    prefixes = {''}
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            prefixes = {prefix + chr(av) for prefix in prefixes}
+        elif op is sre_parse.AT:
+            # zero-width (e.g., \b), and checked anyway when matching at each candidate position
+            continue
+        elif (op is sre_parse.SUBPATTERN and not av[1] & re.IGNORECASE) or op is sre_parse.BRANCH:
+            branches = [av[-1]] if op is sre_parse.SUBPATTERN else av[1]
+            branch_prefixes, complete = set(), True
+            for branch in branches:
+                some_prefixes, some_complete = _sequence_prefixes(branch)
+                branch_prefixes |= some_prefixes
+                complete = complete and some_complete
+            if len(prefixes) * len(branch_prefixes) > _max_literal_prefixes:
+                return prefixes, False
+            prefixes = {prefix + branch_prefix for prefix in prefixes for branch_prefix in branch_prefixes}
+            if not complete:
+                return prefixes, False
+        else:
+            return prefixes, False
+    return prefixes, True
+
+
+def literal_prefixes(regex: Pattern) -> Optional[Set[str]]:
+    '''
+    Return a set of (non-empty) literal strings that every match of `regex` starts with,
+    e.g., {"Hillary", "Clinton"} for "Hillary( [A-Z]\\w*\\.?)? Clinton|Clinton",
+    or None if there is no such set (e.g., for "[A-Z]\\w+" or case-insensitive patterns).
+    '''
+    if not isinstance(regex.pattern, str) or regex.flags & re.IGNORECASE:
+        return None
+    prefixes, _ = _sequence_prefixes(sre_parse.parse(regex.pattern, regex.flags))
+    if '' in prefixes:
+        return None
+    # a match starting with "Hillary Clinton" also starts with "Hillary"
+    return {prefix for prefix in prefixes
+            if not any(other != prefix and prefix.startswith(other) for other in prefixes)}
+
+
+def _trie_pattern(literals: Iterable[str]) -> str:
+    '''
+    Return a regular expression matching the longest of `literals` that occurs at
+    a given position, structured as a trie so that the regex engine follows a single
+    branch per character instead of trying each literal in turn.
+    '''
+    trie: dict = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        # mark the end of a literal with an empty key
+        node[''] = {}
+
+    def node_pattern(node: dict) -> str:
+        branches = [re.escape(char) + node_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # the greedy ? tries the longer literals first
+        return f'(?:{pattern})?' if '' in node else pattern
+
+    return node_pattern(trie)
+
+
+def _match_at(regex: Pattern, text: str, positions: Iterable[int]) -> Iterator[Match]:
+    # same as regex.finditer(text), given all the (ascending) positions where a match may start
+    end = 0
+    for position in positions:
+        if position >= end:
+            match = regex.match(text, position)
+            if match:
+                end = match.end()
+                yield match
+
+
+class MultiPattern:
+    '''
+    Several named regular expressions (strings or compiled patterns), each of which
+    is matched independently, exactly as if scanned on its own with re.finditer:
+    matches of one pattern do not overlap each other, but may overlap those of
+    the other patterns (e.g., "Clinton" within "Hillary Clinton").
+
+    Rather than scanning each text once per pattern, the literal prefixes of all the
+    patterns (see literal_prefixes) are found in a single scan, as a trie-shaped regex,
+    and each pattern is only tried where one of its own prefixes occurs. Patterns
+    without literal prefixes are still scanned for separately.
+    '''
+    def __init__(self, patterns: Mapping[str, Union[str, Pattern]]):
+        self.names = list(patterns)
+        self.regexes = [re.compile(pattern) for pattern in patterns.values()]
+        # positions (in `regexes`) of the patterns starting with each literal prefix
+        positions_by_prefix: Dict[str, List[int]] = {}
+        self._unprefixed = []
+        for i, regex in enumerate(self.regexes):
+            prefixes = literal_prefixes(regex)
+            if prefixes is None:
+                self._unprefixed.append(i)
+            for prefix in prefixes or ():
+                positions_by_prefix.setdefault(prefix, []).append(i)
+        # the prefix scan finds only the longest prefix at each position, which implies all its own prefixes
+        self._prefix_positions = {
+            prefix: sorted({i for end in range(1, len(prefix) + 1) for i in positions_by_prefix.get(prefix[:end], ())})
+            for prefix in positions_by_prefix
+        }
+        # a lookahead, so that prefixes overlapping each other are all found
+        self._prefix_regex = None
+        if positions_by_prefix:
+            self._prefix_regex = re.compile(f'(?=({_trie_pattern(positions_by_prefix)}))')
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.names!r}>"
+
+    def _iter_pattern_matches(self, text: str) -> List[Iterator[Match]]:
+        '''
+        Return an iterator over the matches in `text` of each pattern, in the order of `names`.
+        '''
+        candidates: List[List[int]] = [[] for _ in self.regexes]
+        if self._prefix_regex is not None:
+            for prefix_match in self._prefix_regex.finditer(text):
+                start = prefix_match.start()
+                for i in self._prefix_positions[prefix_match.group(1)]:
+                    candidates[i].append(start)
+        matches = [_match_at(regex, text, positions) for regex, positions in zip(self.regexes, candidates)]
+        for i in self._unprefixed:
+            matches[i] = self.regexes[i].finditer(text)
+        return matches
+
+    def finditer(self, text: str) -> Iterator[Tuple[str, Match]]:
+        '''
+        Iterate over (name, match) pairs for each match of each pattern in `text`,
+        in order of position (and then of `names`).
+        '''
+        matches = [zip(itertools.repeat(name), pattern_matches)
+                   for name, pattern_matches in zip(self.names, self._iter_pattern_matches(text))]
+        # heapq.merge is stable, so ties on position are broken in order of `names`
+        yield from heapq.merge(*matches, key=lambda item: item[1].start())
+
+    def count(self, text: str) -> np.ndarray:
+        '''
+        Return the number of matches of each pattern in `text`, in the order of `names`.
+        '''
+        return np.array([sum(1 for _ in pattern_matches) for pattern_matches in self._iter_pattern_matches(text)],
+                        dtype=np.int64)
+
+
+def count_pattern_matches(texts: Iterable[str],
+                          patterns: Union[MultiPattern, Mapping[str, Union[str, Pattern]]]) -> np.ndarray:
+    '''
+    Count the matches of each of the named `patterns` (see MultiPattern) in each text in `texts`,
+    returning an (n_texts x n_patterns) array of match counts.
+    '''
+    if not isinstance(patterns, MultiPattern):
+        patterns = MultiPattern(patterns)
+    counts = [patterns.count(text) for text in texts]
+    return np.array(counts, dtype=np.int64).reshape(len(counts), len(patterns.names))
+
+
+def _iter_match_spans(haystack_doc: Doc, matches: Iterable[Tuple[Hashable, Match]],
+                      preceding_window: int, subsequent_window: int):
+    offsets = token_offsets(haystack_doc)
+    matches = list(matches)
+    starts = np.array([match.start() for _, match in matches], dtype=offsets.dtype)
+    token_indices = np.searchsorted(offsets, starts).tolist()
+    n_tokens = len(offsets)
+    for (key, match), start, token_i in zip(matches, starts.tolist(), token_indices):
         # not all matches will line up with a token
-        if start in haystack_idx_to_i:
-            token_i = haystack_idx_to_i[start]
+        if token_i < n_tokens and offsets[token_i] == start:
             # calculate indices of windows; spaCy chokes on negative indices,
             # but indices greater than the largest are totally okay
             preceding_start = max(token_i - preceding_window, 0)
-            # TODO: memoize this? most of the time group() will be the same, but
+            # most of the time group() will be the same, but
             # we need to check how long it is, in spaCy terms
-            match_length = len(nlp(match.group(), disable=["tagger", "parser", "ner"]))
-            subsequent_start = token_i + match_length
+            subsequent_start = token_i + count_tokens(match.group())
             subsequent_end = subsequent_start + subsequent_window
-            yield (haystack_doc[preceding_start:token_i],
-                   haystack_doc[token_i:subsequent_start],
-                   haystack_doc[subsequent_start:subsequent_end])
+            yield key, (haystack_doc[preceding_start:token_i],
+                        haystack_doc[token_i:subsequent_start],
+                        haystack_doc[subsequent_start:subsequent_end])
         else:
             logger.debug('Failed to find token at idx=%d', start)
 
 
+def context_spans(haystack_doc: Doc, needle_re, preceding_window: int, subsequent_window: int):
+    '''
+    Return tuples for each (potentially overlapping) match of needle_re within haystack_doc,
+    of the form (preceding_span, match_span, subsequent_span), where each *_span is a spaCy Span instance.
+
+    TODO: use doc.char_span(start, end, label=0, vector=None), introduced in spaCy v2.0.0a10
+    See https://github.com/explosion/spaCy/issues/1264 and https://github.com/explosion/spaCy/issues/1050
+    '''
+    matches = ((None, match) for match in needle_re.finditer(haystack_doc.text))
+    for _, spans in _iter_match_spans(haystack_doc, matches, preceding_window, subsequent_window):
+        yield spans
+
+
+def multi_context_spans(haystack_doc: Doc,
+                        needles: Union[MultiPattern, Mapping[str, Union[str, Pattern]]],
+                        preceding_window: int,
+                        subsequent_window: int) -> Iterator[Tuple[str, Tuple[Span, Span, Span]]]:
+    '''
+    Like context_spans, but for several named needle patterns at once (see MultiPattern),
+    yielding (name, (preceding_span, match_span, subsequent_span)) in order of position,
+    exactly as calling context_spans for each needle would, but sharing the token offsets.
+    '''
+    if not isinstance(needles, MultiPattern):
+        needles = MultiPattern(needles)
+    matches = needles.finditer(haystack_doc.text)
+    yield from _iter_match_spans(haystack_doc, matches, preceding_window, subsequent_window)
+
+
 def context_tokens(haystack_doc: Doc, needle_re, preceding_window, subsequent_window: int):
     '''
     Iterate over all the Tokens in all the pre/post context Spans
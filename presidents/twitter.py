@@ -0,0 +1,191 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+import gzip
+import logging
+import re
+
+from presidents import DATA_DIR
+from presidents.ldjson import fast_loads
+
+logger = logging.getLogger(__name__)
+
+twitter_dirpath = DATA_DIR / 'twitter'
+
+# every "created_at" in a tweet's JSON: the tweet's own, but also its user's,
+# and those of any retweeted or quoted tweets
+_created_at_regex = re.compile(rb'"created_at":\s*"([^"]*)"')
+_month_numbers = {month: i for i, month in enumerate(
+    ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], 1)}
+
+
+def parse_created_at(created_at: str) -> datetime:
+    '''
+    Parse Twitter's timestamp format, e.g., "Thu Nov 02 18:43:47 +0000 2017"
+    '''
+    if created_at[20:25] != '+0000':
+        return datetime.strptime(created_at, '%a %b %d %H:%M:%S %z %Y')
+    # the usual (UTC) case, which is much faster to slice up than to strptime
+    return datetime(int(created_at[26:30]), _month_numbers[created_at[4:7]],
+                    int(created_at[8:10]), int(created_at[11:13]), int(created_at[14:16]), int(created_at[17:19]),
+                    tzinfo=timezone.utc)
+
+
+def _as_utc(when: datetime) -> datetime:
+    return when if when.tzinfo is not None else when.replace(tzinfo=timezone.utc)
+
+
+def _read_gzip(path: Path) -> bytes:
+    # zlib releases the GIL while decompressing the whole file in one go,
+    # so this runs in parallel across threads
+    return gzip.decompress(Path(path).read_bytes())
+
+
+def _iter_decompressed(paths: Iterable[Path], max_workers: int) -> Iterator[Tuple[Path, bytes]]:
+    '''
+    Decompress up to `max_workers` of the files at `paths` at a time, yielding
+    (path, contents) in order
+    '''
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending = deque()
+        for path in paths:
+            pending.append((path, executor.submit(_read_gzip, path)))
+            if len(pending) > max_workers:
+                path, future = pending.popleft()
+                yield path, future.result()
+        while pending:
+            path, future = pending.popleft()
+            yield path, future.result()
+
+
+def iter_tweet_paths(screen_name: str = 'realDonaldTrump', dirpath: Path = twitter_dirpath) -> Iterator[Path]:
+    return iter(sorted(Path(dirpath).glob(f'{screen_name}-*.json.gz')))
+
+
+def _created_at_key(created_at: bytes) -> bytes:
+    '''
+    Rearrange a created_at like b"Thu Nov 02 18:43:47 +0000 2017" into a key
+    like b"20171102 18:43:47" that sorts chronologically, without parsing it
+    (Twitter always uses UTC)
+    '''
+    if created_at[20:25] != b'+0000':
+        # not the usual format, so take the slow road
+        created = parse_created_at(created_at.decode('ascii')).astimezone(timezone.utc)
+        return created.strftime('%Y%m%d %H:%M:%S').encode('ascii')
+    return created_at[26:30] + b'%02d' % _month_numbers[created_at[4:7].decode('ascii')] + created_at[8:19]
+
+
+def _may_be_created_in(line: bytes, start_key: Optional[bytes], end_key: Optional[bytes]) -> bool:
+    '''
+    Return False if none of the "created_at" values anywhere in the tweet JSON `line`
+    are in [start, end) (given as _created_at_key's), in which case the tweet itself
+    cannot be either.
+    '''
+    for created_at in _created_at_regex.findall(line):
+        key = _created_at_key(created_at)
+        if (start_key is None or key >= start_key) and (end_key is None or key < end_key):
+            return True
+    return False
+
+
+def _datetime_key(when: Optional[datetime]) -> Optional[bytes]:
+    if when is None:
+        return None
+    return _as_utc(when).astimezone(timezone.utc).strftime('%Y%m%d %H:%M:%S').encode('ascii')
+
+
+def project_tweet(line: bytes, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Optional[dict]:
+    '''
+    Return only the text, created_at, id, and retweet status of the tweet JSON `line`,
+    or None if it was not created in [start, end).
+
+    If `start` or `end` is given, lines that are certainly outside that range are
+    rejected before being decoded. They should be timezone-aware (or naive, in UTC).
+    '''
+    if start is not None or end is not None:
+        if not _may_be_created_in(line, _datetime_key(start), _datetime_key(end)):
+            return None
+    tweet = fast_loads(line)
+    created = parse_created_at(tweet['created_at'])
+    if (start is not None and created < _as_utc(start)) or (end is not None and created >= _as_utc(end)):
+        return None
+    return {
+        # newer tweets (in "extended" mode) have full_text; older ones only text
+        'text': tweet.get('full_text', tweet.get('text')),
+        'created_at': created,
+        # jq turns long integer ids into (rounded) floats, so prefer id_str
+        'id': int(tweet['id_str']) if 'id_str' in tweet else tweet['id'],
+        'is_retweet': 'retweeted_status' in tweet,
+    }
+
+
+def iter_tweet_records(contents: bytes,
+                       screen_name: str = 'realDonaldTrump',
+                       start: Optional[datetime] = None,
+                       end: Optional[datetime] = None,
+                       author: Optional[str] = None) -> Iterator[dict]:
+    '''
+    Iterate over the tweets in `contents` (line-delimited tweet JSON) created in
+    [start, end) as standard speech dicts; see read_tweets.
+    '''
+    for line in contents.split(b'\n'):
+        if not line.strip():
+            continue
+        tweet = project_tweet(line, start, end)
+        if tweet is None:
+            continue
+        yield {
+            'title': f'Tweet {tweet["id"]}',
+            'author': author or f'@{screen_name}',
+            'text': tweet['text'],
+            'source': f'https://twitter.com/{screen_name}/status/{tweet["id"]}',
+            'timestamp': tweet['created_at'].isoformat(),
+            'id': tweet['id'],
+            'is_retweet': tweet['is_retweet'],
+        }
+
+
+def path_screen_name(path: Path) -> str:
+    '''
+    Return the screen name of the tweets in `path`, named like `screen_name`-*.json.gz
+    '''
+    screen_name, _ = Path(path).name.rsplit('-', 1)
+    return screen_name
+
+
+def read_tweet_file(path: Path, author: Optional[str] = None) -> Iterator[dict]:
+    '''
+    Read all the tweets in the single file at `path` (as written to twitter_dirpath)
+    as standard speech dicts; see read_tweets.
+    '''
+    return iter_tweet_records(_read_gzip(path), path_screen_name(path), author=author)
+
+
+def read_tweets(screen_name: str = 'realDonaldTrump',
+                start: Optional[datetime] = None,
+                end: Optional[datetime] = None,
+                author: Optional[str] = None,
+                max_workers: int = 4,
+                dirpath: Path = twitter_dirpath) -> Iterator[dict]:
+    '''
+    Stream the tweets of `screen_name` created in [start, end) from the
+    line-delimited JSON files `dirpath`/`screen_name`-*.json.gz, decompressing
+    up to `max_workers` files in parallel, yielding standard speech dicts
+    (as accepted by Speech.from_json), attributed to `author` (or @`screen_name`),
+    with the tweet's "id" and "is_retweet" as metadata.
+    '''
+    paths = list(iter_tweet_paths(screen_name, dirpath))
+    for path, contents in _iter_decompressed(paths, max_workers):
+        logger.debug('Reading %s (%d bytes)', path, len(contents))
+        yield from iter_tweet_records(contents, screen_name, start, end, author)
+
+
+def read_tweet_speeches(*args, **kwargs):
+    '''
+    Like read_tweets(...), but yielding Speech instances
+    '''
+    from presidents.models import Speech
+    for record in read_tweets(*args, **kwargs):
+        yield Speech.from_json(**record)
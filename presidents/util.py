@@ -1,8 +1,8 @@
 from collections import OrderedDict
 from collections.abc import Hashable
-from datetime import date
-from functools import reduce
-from typing import Optional
+from datetime import date, datetime, timezone, tzinfo
+from functools import lru_cache, reduce
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 import logging
 import operator
 import re
@@ -11,6 +11,9 @@ import dateutil.parser
 import dateutil.tz
 import pytz
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,7 +39,64 @@ def _iter_tzinfos():
         yield alias, dateutil.tz.gettz(name)
 
 
-tzinfos = dict(_iter_tzinfos())
+@lru_cache()
+def load_tzinfos() -> Dict[str, tzinfo]:
+    '''
+    Build the mapping from timezone names to tzinfo objects that parse_date uses
+    (on first use, since calling dateutil.tz.gettz on every zone takes a while).
+    '''
+    return dict(_iter_tzinfos())
+
+
+def __getattr__(name: str):
+    # `tzinfos` is built on first access; see load_tzinfos
+    if name == 'tzinfos':
+        return load_tzinfos()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ISO 8601 dates and datetimes, with an optional UTC offset, as written by datetime.isoformat()
+_iso_regex = re.compile(r'\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?'
+                        r'(?P<offset>Z|[+-]\d{2}:\d{2})?')
+# dates like "January 20, 2017"
+_long_date_regex = re.compile(r'[A-Z][a-z]+ \d{1,2}, \d{4}')
+
+
+def _dateutil_tzinfo(tzinfo: timezone):
+    '''
+    Convert a fixed-offset datetime.timezone into the tzinfo dateutil would have used
+    '''
+    offset = tzinfo.utcoffset(None)
+    if not offset:
+        # dateutil calls a zero offset "UTC", and then looks that up in tzinfos
+        return load_tzinfos().get('UTC', dateutil.tz.tzutc())
+    return dateutil.tz.tzoffset(None, offset.total_seconds())
+
+
+@lru_cache(maxsize=2**16)
+def _parse_date(text: str) -> datetime:
+    '''
+    Parse `text` like dateutil.parser.parse(text, fuzzy=True, tzinfos=tzinfos),
+    but first trying the exact formats that cover most of our timestamps
+    '''
+    iso_match = _iso_regex.fullmatch(text)
+    if iso_match:
+        try:
+            date_instance = datetime.fromisoformat(text)
+        except ValueError:
+            # before Python 3.11, fromisoformat rejects "Z" and fractions other than 3 or 6 digits
+            pass
+        else:
+            if iso_match.group('offset'):
+                date_instance = date_instance.replace(tzinfo=_dateutil_tzinfo(date_instance.tzinfo))
+            return date_instance
+    if _long_date_regex.fullmatch(text):
+        try:
+            return datetime.strptime(text, '%B %d, %Y')
+        except ValueError:
+            # e.g., TAPP's "January 0, 2017" (see dateutil's handling)
+            pass
+    return dateutil.parser.parse(text, fuzzy=True, tzinfos=load_tzinfos())
 
 
 def parse_date(text: str, default_tzinfo: Optional[str] = None) -> date:
@@ -44,14 +104,42 @@ def parse_date(text: str, default_tzinfo: Optional[str] = None) -> date:
     Parse the string `text` as a standard Python datetime using the dateutil library,
     setting its timezone to `default_tzinfo`
     iff default_tzinfo is provided _and_ `s` does not specify a timezone.
+
+    Results are memoized, and ISO 8601 and "January 20, 2017"-style strings
+    are parsed directly, without dateutil's (slow) fuzzy parser.
     '''
-    date_instance = dateutil.parser.parse(text, fuzzy=True, tzinfos=tzinfos)
+    date_instance = _parse_date(text)
     if default_tzinfo is not None:
         logger.debug('Setting timezone for %s to default: %s', date_instance, default_tzinfo)
         date_instance = date_instance.replace(tzinfo=date_instance.tzinfo or default_tzinfo)
     return date_instance
 
 
+def parse_dates(texts: Iterable[str], default_tzinfo: Optional[str] = None) -> 'np.ndarray':
+    '''
+    Parse each of `texts` like parse_date(text, default_tzinfo), returning an
+    array of datetime64[us]; timezone-aware datetimes are converted to (naive) UTC,
+    and missing values (None or empty strings) become NaT.
+    '''
+    import numpy as np
+    texts = np.array([text or '' for text in texts], dtype=str)
+    iso_matches = (_iso_regex.fullmatch(text) for text in texts if text)
+    if default_tzinfo is None and all(match and match.group('offset') is None for match in iso_matches):
+        # numpy parses naive ISO 8601 strings itself (and '' as NaT)
+        return np.array(texts, dtype='datetime64[us]')
+    unique_texts, inverse = np.unique(texts, return_inverse=True)
+    unique_datetimes = np.empty(len(unique_texts), dtype='datetime64[us]')
+    for i, text in enumerate(unique_texts):
+        if not text:
+            unique_datetimes[i] = np.datetime64('NaT')
+            continue
+        date_instance = parse_date(text, default_tzinfo)
+        if date_instance.tzinfo is not None:
+            date_instance = date_instance.astimezone(timezone.utc).replace(tzinfo=None)
+        unique_datetimes[i] = np.datetime64(date_instance, 'us')
+    return unique_datetimes[inverse]
+
+
 def calculate_election_day(inauguration_date: date) -> date:
     '''
     Calculate the date of Election Day corresponding to the given `inauguration_date`
@@ -97,4 +185,4 @@ class hashabledict(OrderedDict, Hashable):
     __repr__ = dict.__repr__
 
     def __hash__(self) -> int:
-        return reduce(operator.xor, map(hash, self.items()))
+        return reduce(operator.xor, map(hash, self.items()), 0)
@@ -1,8 +1,9 @@
 from pathlib import Path
-from typing import Iterable, Iterator
+from typing import Iterable, Iterator, List, Union
 import logging
 import subprocess
 
+from scipy import sparse
 import altair as alt
 import numpy as np
 import pandas as pd
@@ -91,6 +92,54 @@ def create_pairwise_df(xs, cmp_func, label_func):
     return df_pivot[labels].reindex(labels)
 
 
+def cosine_similarity_matrix(matrix: Union[np.ndarray, sparse.spmatrix], chunk_size: int = 1000) -> np.ndarray:
+    '''
+    matrix: (n x d) array of row vectors; either dense (e.g., spaCy doc vectors,
+            for which this matches Doc.similarity) or sparse (e.g., DocumentTermMatrix.counts)
+    chunk_size: number of rows to multiply at a time
+
+    returns: (n x n) array of the cosine similarity between each pair of rows,
+             where rows with zero norm have zero similarity to everything.
+             Only the blocks on or above the diagonal are computed; the rest are mirrored.
+    '''
+    if sparse.issparse(matrix):
+        matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    else:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        norms = np.linalg.norm(matrix, axis=1)
+    inverse_norms = np.zeros_like(norms)
+    np.divide(1.0, norms, out=inverse_norms, where=norms > 0)
+    normalized = sparse.diags(inverse_norms) @ matrix
+
+    n = normalized.shape[0]
+    similarities = np.empty((n, n))
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        block = normalized[start:end] @ normalized[start:].T
+        if sparse.issparse(block):
+            block = block.toarray()
+        similarities[start:end, start:] = block
+        similarities[start:, start:end] = block.T
+    return similarities
+
+
+def create_similarity_df(matrix: Union[np.ndarray, sparse.spmatrix], labels: List[str],
+                         chunk_size: int = 1000) -> pd.DataFrame:
+    '''
+    Matrix-native alternative to create_pairwise_df for cosine similarity.
+
+    matrix: (n x d) array of row vectors, as for cosine_similarity_matrix
+    labels: list of n labels, one for each row of `matrix`
+
+    returns: square pd.DataFrame with n rows and columns, in the order of `labels`
+    '''
+    values = cosine_similarity_matrix(matrix, chunk_size)
+    return pd.DataFrame(values,
+                        index=pd.Index(labels, name='row'),
+                        columns=pd.Index(labels, name='column'))
+
+
 def plot_pairwise_df(df: pd.DataFrame, plt, cmap=None, labelsize: int = 8):
     if cmap is None:
         cmap = plt.cm.hot_r